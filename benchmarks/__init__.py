@@ -0,0 +1 @@
+"""Offline benchmarks for the Daybetter LED Strip integration."""
@@ -0,0 +1,375 @@
+"""
+Benchmark the integration against simulated strips.
+
+Sets up real config entries of the integration in a bare Home Assistant
+instance, with the library and the bluetooth integration replaced by the
+simulation, and measures for each strip count:
+
+- command latency percentiles while every strip is commanded at once
+- scene fan-out time through the set_many service implementation, with
+  optionally some strips out of range
+- time spent processing advertisements
+- frame rate of a host effect running on every strip, and the latency of
+  turning the strips off from the dashboard while it runs
+- event loop lag while all of the above runs
+
+Run from the repository root with `scripts/benchmark --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from contextlib import ExitStack, asynccontextmanager
+from functools import partial
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+
+from custom_components import daybetter_led
+from custom_components.daybetter_led.commands import DaybetterLedStripCommand
+from custom_components.daybetter_led.const import (
+    DEFAULT_COMMAND_TIMEOUT,
+    DOMAIN,
+    Priority,
+)
+from custom_components.daybetter_led.effects import EFFECT_RAINBOW, host_effect_frames
+from custom_components.daybetter_led.profiler import async_get_profiler
+from custom_components.daybetter_led.services import async_fan_out
+
+from .simulated import SimulatedBluetooth, SimulatedLink
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from custom_components.daybetter_led.models import DaybetterLedStripConfigEntry
+    from custom_components.daybetter_led.profiler import DaybetterLedStripProfiler
+
+# Seconds between event loop lag probes
+LAG_PROBE_INTERVAL = 0.01
+# Callbacks listed by --profile, the most expensive first
+PROFILE_TOP = 8
+
+
+class LoopLagProbe:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self) -> None:
+        """Initialize an idle probe."""
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.samples.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+    @asynccontextmanager
+    async def async_measure(self) -> AsyncIterator[list[float]]:
+        """Probe while the context is active, yielding the samples."""
+        self.samples = []
+        self._task = asyncio.create_task(self._async_run())
+        try:
+            yield self.samples
+        finally:
+            self._task.cancel()
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Summarize samples in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "p50": at(0.5),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": ordered[-1] * 1000,
+    }
+
+
+def format_ms(summary: dict[str, float]) -> str:
+    """Format a percentile summary."""
+    return " ".join(f"{key}={value:.1f}ms" for key, value in summary.items())
+
+
+@asynccontextmanager
+async def async_simulated_hass(
+    bluetooth: SimulatedBluetooth,
+) -> AsyncIterator[HomeAssistant]:
+    """Run a bare Home Assistant with the simulation patched in."""
+    with tempfile.TemporaryDirectory() as config_dir, ExitStack() as stack:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = Mock(async_forward_entry_setups=AsyncMock())
+        for name in (
+            "async_last_service_info",
+            "async_register_callback",
+            "async_scanner_devices_by_address",
+            "async_track_unavailable",
+            "async_address_present",
+        ):
+            stack.enter_context(
+                patch(
+                    f"homeassistant.components.bluetooth.{name}",
+                    getattr(bluetooth, name),
+                )
+            )
+        stack.enter_context(
+            patch.object(daybetter_led, "DaybetterLedStrip", bluetooth.create_strip)
+        )
+        stack.enter_context(
+            patch.object(daybetter_led, "async_get_loaded_integration", Mock())
+        )
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def async_setup_strips(
+    hass: HomeAssistant, count: int, options: dict[str, Any]
+) -> list[DaybetterLedStripConfigEntry]:
+    """Set up one config entry per simulated strip."""
+    entries: list[DaybetterLedStripConfigEntry] = []
+    for index in range(count):
+        address = f"AA:BB:CC:00:{index >> 8:02X}:{index & 0xFF:02X}"
+        entry = ConfigEntry(
+            data={CONF_ADDRESS: address},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options=options,
+            source="user",
+            subentries_data=None,
+            title=f"Strip {index}",
+            unique_id=address,
+            version=1,
+        )
+        await daybetter_led.async_setup_entry(hass, entry)
+        # stands in for the entities listening to every field
+        entry.runtime_data.coordinator.async_add_listener(lambda: None)
+        entries.append(entry)
+    return entries
+
+
+async def async_timed(target: Callable[[], Awaitable[Any]]) -> float:
+    """Await a target and return the seconds it took."""
+    start = time.perf_counter()
+    await target()
+    return time.perf_counter() - start
+
+
+def random_color(bluetooth: SimulatedBluetooth) -> tuple[int, int, int]:
+    """Pick a random color from the simulation's seeded generator."""
+    rng = bluetooth.rng
+    return (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+
+
+def print_profile(profiler: DaybetterLedStripProfiler) -> None:
+    """Stop profiling and print the most expensive callbacks."""
+    profiler.async_stop()
+    for name, stats in list(profiler.as_dict()["callbacks"].items())[:PROFILE_TOP]:
+        print(  # noqa: T201
+            f"  {name:<45} calls={stats['calls']} "
+            f"total={stats['total_ms']}ms max={stats['max_ms']}ms "
+            f"slow={stats['slow']}"
+        )
+
+
+async def async_benchmark(
+    count: int, args: argparse.Namespace, link: SimulatedLink
+) -> None:
+    """Run every measurement for a strip count and print the results."""
+    bluetooth = SimulatedBluetooth(link, args.adapters, args.seed)
+    options = {
+        "write_rate": args.write_rate,
+        "idle_timeout": 0,
+        "command_timeout": args.command_timeout,
+    }
+    async with async_simulated_hass(bluetooth) as hass:
+        probe = LoopLagProbe()
+        entries = await async_setup_strips(hass, count, options)
+        print(f"strips={count}")  # noqa: T201
+        profiler = async_get_profiler(hass)
+        if args.profile:
+            profiler.async_start()
+
+        # commands: every strip receives a stream of colors at once
+        async with probe.async_measure() as lag:
+
+            async def _async_command_stream(
+                entry: DaybetterLedStripConfigEntry,
+            ) -> list[float]:
+                commands = entry.runtime_data.commands
+                return [
+                    await async_timed(
+                        lambda: commands.async_send(
+                            DaybetterLedStripCommand(
+                                power=True, color=random_color(bluetooth)
+                            )
+                        )
+                    )
+                    for _ in range(args.commands)
+                ]
+
+            streams = await asyncio.gather(
+                *(_async_command_stream(entry) for entry in entries)
+            )
+        latencies = [latency for stream in streams for latency in stream]
+        print(f"  command latency   {format_ms(percentiles(latencies))}")  # noqa: T201
+        print(f"  loop lag          {format_ms(percentiles(lag))}")  # noqa: T201
+
+        # scenes: the same state sent to all strips through set_many
+        for strip in list(bluetooth.strips.values())[: args.dead]:
+            strip.dead = True
+            # out of range strips are disconnected
+            await strip.disconnect()
+        async with probe.async_measure() as lag:
+            durations = []
+            failed = 0
+            for _ in range(args.scenes):
+                color = random_color(bluetooth)
+                result = await async_fan_out(
+                    hass,
+                    {
+                        entry.entry_id: (
+                            entry,
+                            DaybetterLedStripCommand(color=color),
+                        )
+                        for entry in entries
+                    },
+                    args.max_concurrency,
+                )
+                durations.append(result["duration"] / 1000)
+                failed += sum(
+                    not strip["success"] for strip in result["strips"].values()
+                )
+        print(f"  scene fan-out     {format_ms(percentiles(durations))}")  # noqa: T201
+        print(f"  failed commands   {failed}")  # noqa: T201
+        print(f"  loop lag          {format_ms(percentiles(lag))}")  # noqa: T201
+
+        # advertisements: every strip advertises at the configured rate
+        async with probe.async_measure() as lag:
+            await bluetooth.async_advertise(args.duration)
+        per_advertisement = bluetooth.callback_time / max(1, bluetooth.advertisements)
+        print(  # noqa: T201
+            f"  advertisements    count={bluetooth.advertisements} "
+            f"total={bluetooth.callback_time * 1000:.1f}ms "
+            f"per={per_advertisement * 1e6:.1f}us"
+        )
+        print(f"  loop lag          {format_ms(percentiles(lag))}")  # noqa: T201
+
+        # effects: every strip streams a host effect
+        writes = sum(strip.writes for strip in bluetooth.strips.values())
+        async with probe.async_measure() as lag:
+            for entry in entries:
+                entry.runtime_data.frames.async_start(
+                    host_effect_frames(EFFECT_RAINBOW, (255, 255, 255), 1.0)
+                )
+            await asyncio.sleep(args.duration)
+            frames = sum(strip.writes for strip in bluetooth.strips.values()) - writes
+            # the frames keep streaming while the strips are turned off
+            offs = await asyncio.gather(
+                *(
+                    async_timed(
+                        partial(
+                            entry.runtime_data.commands.async_send,
+                            DaybetterLedStripCommand(power=False),
+                            Priority.INTERACTIVE,
+                        )
+                    )
+                    for entry in entries
+                )
+            )
+            for entry in entries:
+                entry.runtime_data.frames.async_cancel()
+        print(  # noqa: T201
+            f"  effect frames     per strip={frames / count / args.duration:.1f}/s"
+        )
+        print(f"  off during effect {format_ms(percentiles(offs))}")  # noqa: T201
+        print(f"  loop lag          {format_ms(percentiles(lag))}")  # noqa: T201
+
+        writes = sum(strip.writes for strip in bluetooth.strips.values())
+        connects = sum(strip.connects for strip in bluetooth.strips.values())
+        skipped = sum(entry.runtime_data.metrics.skipped_writes for entry in entries)
+        print(  # noqa: T201
+            f"  writes={writes} skipped={skipped} connects={connects}"
+        )
+
+        if args.profile:
+            print_profile(profiler)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    link = SimulatedLink()
+    parser = argparse.ArgumentParser(
+        prog="scripts/benchmark", description=__doc__.split("\n\n")[0].strip()
+    )
+    parser.add_argument(
+        "--strips",
+        default="1,10,50,200",
+        help="comma separated strip counts (default: %(default)s)",
+    )
+    parser.add_argument("--commands", type=int, default=20, help="per strip")
+    parser.add_argument("--scenes", type=int, default=10)
+    parser.add_argument(
+        "--duration", type=float, default=5, help="seconds of advertisements"
+    )
+    parser.add_argument("--adapters", type=int, default=1)
+    parser.add_argument("--max-concurrency", type=int, default=3)
+    parser.add_argument("--write-rate", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=link.latency)
+    parser.add_argument("--jitter", type=float, default=link.jitter)
+    parser.add_argument("--loss", type=float, default=link.loss)
+    parser.add_argument("--connect-latency", type=float, default=link.connect_latency)
+    parser.add_argument(
+        "--advertisement-rate", type=float, default=link.advertisement_rate
+    )
+    parser.add_argument(
+        "--dead", type=int, default=0, help="strips that are out of range"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--command-timeout",
+        type=int,
+        default=DEFAULT_COMMAND_TIMEOUT,
+        help="seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report the event loop time of the integration's callbacks",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    link = SimulatedLink(
+        latency=args.latency,
+        jitter=args.jitter,
+        loss=args.loss,
+        connect_latency=args.connect_latency,
+        advertisement_rate=args.advertisement_rate,
+    )
+    for count in (int(count) for count in args.strips.split(",")):
+        asyncio.run(async_benchmark(count, args, link))
+
+
+main()
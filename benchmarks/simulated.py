@@ -0,0 +1,344 @@
+"""Simulated Daybetter LED strips and Bluetooth environment."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from daybetter_led_strip.const import (
+    COMMAND_BRIGHTNESS,
+    COMMAND_COLOR,
+    COMMAND_EFFECT,
+    COMMAND_POWER,
+    Effect,
+)
+from homeassistant.components.bluetooth import (
+    BluetoothScannerDevice,
+    BluetoothServiceInfoBleak,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from daybetter_led_strip.util import RgbColor
+    from homeassistant.core import HomeAssistant
+
+    Listener = Callable[[], None]
+    AdvertisementCallback = Callable[[BluetoothServiceInfoBleak, Any], None]
+
+# Manufacturer data advertised by the simulated strips
+MANUFACTURER_ID = 0x0D28
+
+
+@dataclass(slots=True)
+class SimulatedLink:
+    """Radio characteristics shared by the simulated strips."""
+
+    # seconds until a write is acknowledged
+    latency: float = 0.03
+    # seconds of uniform random delay added to every write
+    jitter: float = 0.01
+    # chance that the strip never acks a write
+    loss: float = 0.0
+    # seconds to establish a connection
+    connect_latency: float = 0.5
+    # seconds until connecting to an out of range strip gives up, like the
+    # retries of bleak-retry-connector
+    dead_connect_latency: float = 15.0
+    # advertisements per second and strip
+    advertisement_rate: float = 5.0
+    # dBm of random RSSI variation between advertisements
+    rssi_noise: int = 4
+
+
+class SimulatedDaybetterLedStrip:
+    """
+    Stand-in for DaybetterLedStrip that never touches Bluetooth.
+
+    Mirrors the public API and the pending/ack behavior of the library:
+    writes record a pending value which is committed and reported to the
+    listeners once the strip acks it, unless the ack is lost.
+    """
+
+    device: BLEDevice | None = None
+    advertisment_data: AdvertisementData | None = None
+    client: object | None = None
+
+    def __init__(self, address: str, link: SimulatedLink, rng: random.Random) -> None:
+        """Initialize a disconnected strip."""
+        self.address = address
+        self.link = link
+        self._rng = rng
+        # out of range, connecting always fails
+        self.dead = False
+        self.listeners: list[Listener] = []
+
+        self.pending_power: bool | None = None
+        self.pending_color: RgbColor | None = None
+        self.pending_brightness: int | None = None
+        self.pending_effect: Effect | None = None
+        self.power: bool | None = None
+        self.color: RgbColor | None = None
+        self.brightness: int | None = None
+        self.effect: Effect | None = None
+
+        # total writes and connects, for reporting
+        self.writes = 0
+        self.connects = 0
+
+    async def update_device(
+        self, device: BLEDevice | None, advertisment_data: AdvertisementData | None
+    ) -> None:
+        """Update the device from scanning, reconnecting like the library."""
+        was_connected = self.connected
+        if self.connected:
+            await self.disconnect()
+        self.device = device
+        self.advertisment_data = advertisment_data
+        if not was_connected and device is not None:
+            await self.connect()
+        self._trigger_listeners()
+
+    async def connect(self) -> None:
+        """Connect after the simulated connection delay."""
+        if self.device is None:
+            return
+        if self.dead:
+            await asyncio.sleep(self.link.dead_connect_latency)
+            return
+        await asyncio.sleep(self._delay(self.link.connect_latency))
+        self.connects += 1
+        self.client = object()
+
+    async def disconnect(self) -> None:
+        """Drop the connection."""
+        if self.client is None:
+            return
+        self.client = None
+        self._trigger_listeners()
+
+    async def _write_led_control(self, command: int, payload: bytes) -> None:
+        """Write a command and schedule its ack."""
+        if not self.connected:
+            return
+        self.writes += 1
+        await asyncio.sleep(self._delay(self.link.latency))
+        if self._rng.random() >= self.link.loss:
+            self._ack(command, payload)
+
+    async def set_color(
+        self,
+        new_color: RgbColor,
+        color_correction: bool = True,  # noqa: FBT001, FBT002 library signature
+    ) -> None:
+        """Set the color. Correction is irrelevant to the simulation."""
+        del color_correction
+        self.pending_color = new_color
+        await self._write_led_control(COMMAND_COLOR, bytes(new_color))
+
+    async def set_brightness(self, new_brightness: int) -> None:
+        """Set the brightness (0-100)."""
+        self.pending_brightness = new_brightness
+        await self._write_led_control(COMMAND_BRIGHTNESS, bytes([new_brightness]))
+
+    async def set_effect(self, effect: Effect) -> None:
+        """Start a firmware effect."""
+        self.pending_effect = effect
+        await self._write_led_control(COMMAND_EFFECT, bytes([effect]))
+
+    async def set_power(self, on: bool) -> None:  # noqa: FBT001 library signature
+        """Turn the strip on or off."""
+        self.pending_power = on
+        await self._write_led_control(COMMAND_POWER, bytes([on]))
+
+    def on_change(self, listener: Listener) -> Callable[[], None]:
+        """Add a state change listener."""
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the strip is connected."""
+        return self.client is not None
+
+    @property
+    def rssi(self) -> int | None:
+        """RSSI of the last advertisement."""
+        if self.advertisment_data is None:
+            return None
+        return self.advertisment_data.rssi
+
+    def _delay(self, base: float) -> float:
+        return base + self._rng.uniform(0, self.link.jitter)
+
+    def _ack(self, command: int, payload: bytes) -> None:
+        """Commit the pending value like an ack from the strip would."""
+        if command == COMMAND_POWER and self.pending_power is not None:
+            self.power, self.pending_power = self.pending_power, None
+        elif command == COMMAND_BRIGHTNESS and self.pending_brightness is not None:
+            self.brightness, self.pending_brightness = self.pending_brightness, None
+        elif command == COMMAND_EFFECT and self.pending_effect is not None:
+            self.effect, self.pending_effect = Effect(payload[0]), None
+            self.color = None
+        elif command == COMMAND_COLOR and self.pending_color is not None:
+            self.color, self.pending_color = self.pending_color, None
+            self.effect = None
+        else:
+            return
+        self._trigger_listeners()
+
+    def _trigger_listeners(self) -> None:
+        for listener in list(self.listeners):
+            listener()
+
+
+class SimulatedBluetooth:
+    """
+    Simulated adapters that advertise strips and route callbacks.
+
+    Provides the parts of the bluetooth integration API used by the
+    integration, so config entries can be set up without a radio.
+    """
+
+    def __init__(self, link: SimulatedLink, adapters: int, seed: int = 0) -> None:
+        """Initialize an environment without strips."""
+        self.link = link
+        self.adapters = adapters
+        self.rng = random.Random(seed)  # noqa: S311 not used for security
+        self.strips: dict[str, SimulatedDaybetterLedStrip] = {}
+        self._indexes: dict[str, int] = {}
+        self._callbacks: dict[str, list[AdvertisementCallback]] = {}
+        # seconds spent in advertisement callbacks and their count
+        self.callback_time = 0.0
+        self.advertisements = 0
+
+    def create_strip(self, address: str) -> SimulatedDaybetterLedStrip:
+        """Create the strip behind an address, used in place of the library."""
+        self._indexes[address.upper()] = len(self._indexes)
+        strip = self.strips[address.upper()] = SimulatedDaybetterLedStrip(
+            address, self.link, self.rng
+        )
+        return strip
+
+    def service_info(
+        self, address: str, adapter: int | None = None
+    ) -> BluetoothServiceInfoBleak:
+        """Build an advertisement of a strip as seen by an adapter."""
+        index = self._indexes[address]
+        if adapter is None:
+            adapter = index % self.adapters
+        # every adapter sees the strip with a different, noisy signal
+        rssi = (
+            -60
+            - (index + 11 * adapter) % 30
+            + self.rng.randint(0, self.link.rssi_noise)
+        )
+        source = f"hci{adapter}"
+        manufacturer_data = {MANUFACTURER_ID: b"\x01\x02"}
+        return BluetoothServiceInfoBleak(
+            name="Daybetter LED",
+            address=address,
+            rssi=rssi,
+            manufacturer_data=manufacturer_data,
+            service_data={},
+            service_uuids=[],
+            source=source,
+            device=BLEDevice(address, "Daybetter LED", {"source": source}, rssi),
+            advertisement=AdvertisementData(
+                local_name="Daybetter LED",
+                manufacturer_data=manufacturer_data,
+                service_data={},
+                service_uuids=[],
+                tx_power=None,
+                rssi=rssi,
+                platform_data=(),
+            ),
+            connectable=True,
+            time=time.monotonic(),
+            tx_power=None,
+        )
+
+    def advertise(self, address: str) -> None:
+        """Deliver an advertisement of a strip to the registered callbacks."""
+        service_info = self.service_info(address)
+        start = time.perf_counter()
+        for advertisement_callback in self._callbacks.get(address, ()):
+            advertisement_callback(service_info, None)
+        self.callback_time += time.perf_counter() - start
+        self.advertisements += 1
+
+    async def async_advertise(self, duration: float) -> None:
+        """Advertise every strip at the configured rate for a while."""
+        if self.link.advertisement_rate <= 0:
+            await asyncio.sleep(duration)
+            return
+        interval = 1 / self.link.advertisement_rate
+        loop = asyncio.get_running_loop()
+        end = loop.time() + duration
+        addresses = list(self.strips)
+        while loop.time() < end:
+            # spread the strips over the interval like independent radios
+            for address in addresses:
+                self.advertise(address)
+                await asyncio.sleep(interval / len(addresses))
+
+    # bluetooth integration API
+
+    def async_last_service_info(
+        self, _hass: HomeAssistant, address: str, *, connectable: bool = True
+    ) -> BluetoothServiceInfoBleak | None:
+        """Return the latest advertisement of a strip."""
+        del connectable
+        if address.upper() not in self.strips:
+            return None
+        return self.service_info(address.upper())
+
+    def async_register_callback(
+        self,
+        _hass: HomeAssistant,
+        advertisement_callback: AdvertisementCallback,
+        matcher: dict[str, Any],
+        _mode: Any,
+    ) -> Callable[[], None]:
+        """Register an advertisement callback for one address."""
+        callbacks = self._callbacks.setdefault(matcher["address"].upper(), [])
+        callbacks.append(advertisement_callback)
+        return lambda: callbacks.remove(advertisement_callback)
+
+    def async_scanner_devices_by_address(
+        self, _hass: HomeAssistant, address: str, *, connectable: bool = True
+    ) -> list[BluetoothScannerDevice]:
+        """Return the strip as seen by every adapter."""
+        del connectable
+        if address.upper() not in self.strips:
+            return []
+        devices = []
+        for adapter in range(self.adapters):
+            service_info = self.service_info(address.upper(), adapter)
+            devices.append(
+                BluetoothScannerDevice(
+                    SimpleNamespace(source=service_info.source),
+                    service_info.device,
+                    service_info.advertisement,
+                )
+            )
+        return devices
+
+    def async_track_unavailable(
+        self, *_args: Any, **_kwargs: Any
+    ) -> Callable[[], None]:
+        """Track nothing, simulated strips never stop advertising."""
+        return lambda: None
+
+    def async_address_present(
+        self, _hass: HomeAssistant, address: str, *, connectable: bool = True
+    ) -> bool:
+        """Whether a strip is advertising."""
+        del connectable
+        return address.upper() in self.strips
@@ -20,14 +20,37 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.loader import async_get_loaded_integration
-
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .advertisement import DaybetterLedStripAdvertisementFilter
+from .breaker import DaybetterLedStripCircuitBreaker
+from .cache import async_get_state_cache
+from .color import DaybetterLedStripColorPipeline
+from .commands import DaybetterLedStripCommandQueue
+from .connection import async_get_connection_manager
+from .const import (
+    CONF_IDLE_TIMEOUT,
+    CONF_RSSI_HYSTERESIS,
+    CONF_RSSI_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_RSSI_HYSTERESIS,
+    DEFAULT_RSSI_INTERVAL,
+    DOMAIN,
+)
 from .coordinator import DaybetterLedStripCoordinator
+from .frames import DaybetterLedStripFrameScheduler
+from .metrics import DaybetterLedStripMetrics
 from .models import DaybetterLedStripData
+from .prewarm import async_setup_prewarm
+from .profiler import async_get_profiler
+from .services import async_setup_services
+from .snapshots import async_get_snapshots
 
 if TYPE_CHECKING:
     from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .models import DaybetterLedStripConfigEntry
 
@@ -39,8 +62,19 @@ PLATFORMS: list[Platform] = [
     Platform.LIGHT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-async def async_setup_entry(
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the integration-wide services, state cache and snapshots."""
+    async_setup_services(hass)
+    # one read for all strips
+    await async_get_state_cache(hass).async_load()
+    await async_get_snapshots(hass).async_load()
+    return True
+
+
+async def async_setup_entry(  # noqa: PLR0915
     hass: HomeAssistant,
     entry: DaybetterLedStripConfigEntry,
 ) -> bool:
@@ -48,44 +82,59 @@ async def async_setup_entry(
     address: str = entry.data[CONF_ADDRESS]
 
     led_strip = DaybetterLedStrip(address)
+    # The library keeps listeners in a class attribute shared by every strip,
+    # which would refresh all strips whenever one of them changes
+    led_strip.listeners = []
+    metrics = DaybetterLedStripMetrics()
+    connections = async_get_connection_manager(hass)
+    entry.async_on_unload(
+        connections.async_register(
+            led_strip,
+            entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+            metrics,
+        )
+    )
 
     # It's fine if the device isn't available right now
     ble_device = bluetooth.async_last_service_info(
         hass, address.upper(), connectable=True
     )
 
-    @callback
-    def _async_update_ble(
-        service_info: bluetooth.BluetoothServiceInfoBleak,
-        _change: bluetooth.BluetoothChange,
-    ) -> None:
-        """Update from a ble callback."""
-        entry.async_create_task(
-            hass,
-            led_strip.update_device(service_info.device, service_info.advertisement),
-        )
-
-    entry.async_on_unload(
-        bluetooth.async_register_callback(
-            hass,
-            _async_update_ble,
-            BluetoothCallbackMatcher({ADDRESS: address}),
-            bluetooth.BluetoothScanningMode.PASSIVE,
-        )
-    )
     coordinator = DaybetterLedStripCoordinator(
         hass=hass, logger=_LOGGER, name=DOMAIN, config_entry=entry
     )
+    profiler = coordinator.profiler = async_get_profiler(hass)
+    # the strip doesn't report its state, start from the last known one
+    cache = async_get_state_cache(hass)
+    coordinator.cached_power = cache.async_restore(led_strip)
+    if (cached := cache.async_get(address)) and (source := cached.get("source")):
+        connections.async_restore_route(led_strip, source)
+
+    breaker = DaybetterLedStripCircuitBreaker(hass, entry, metrics)
+    entry.async_on_unload(breaker.async_cancel)
+    colors = DaybetterLedStripColorPipeline.from_options(entry.options)
+    commands = DaybetterLedStripCommandQueue(
+        hass, entry, led_strip, connections, colors, metrics, breaker
+    )
     entry.runtime_data = DaybetterLedStripData(
         device=led_strip,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        colors=colors,
+        commands=commands,
+        frames=DaybetterLedStripFrameScheduler(hass, entry, commands),
+        metrics=metrics,
+        breaker=breaker,
     )
 
     @callback
     def _on_strip_state_change() -> None:
         try:
-            coordinator.refresh_state()
+            with profiler.measure("on_strip_state_change", entry.title):
+                coordinator.refresh_state()
+                cache.async_update(
+                    address, coordinator.data, connections.async_get_source(led_strip)
+                )
         except Exception:
             _LOGGER.exception(
                 "Error while refreshing state: %s", traceback.format_exc()
@@ -94,13 +143,58 @@ async def async_setup_entry(
 
     # Listen for changes
     entry.async_on_unload(led_strip.on_change(_on_strip_state_change))
+    entry.async_on_unload(breaker.async_add_listener(_on_strip_state_change))
+
+    advertisements = DaybetterLedStripAdvertisementFilter(
+        entry.options.get(CONF_RSSI_INTERVAL, DEFAULT_RSSI_INTERVAL),
+        entry.options.get(CONF_RSSI_HYSTERESIS, DEFAULT_RSSI_HYSTERESIS),
+    )
+
+    @callback
+    def _async_update_ble(
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        _change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Update from a ble callback."""
+        with profiler.measure("update_ble", entry.title):
+            metrics.advertisements_received += 1
+            metrics.last_seen = dt_util.utcnow()
+            # Routing sees every advertisement, the filter only throttles
+            # state refreshes. Connections are opened on demand.
+            connections.async_update_advertisement(led_strip, service_info)
+            if not advertisements.accept(service_info):
+                return
+            metrics.advertisements_processed += 1
+            _on_strip_state_change()
+
+    entry.async_on_unload(
+        bluetooth.async_register_callback(
+            hass,
+            _async_update_ble,
+            BluetoothCallbackMatcher({ADDRESS: address}),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+    )
+
+    @callback
+    def _async_unavailable(_service_info: bluetooth.BluetoothServiceInfoBleak) -> None:
+        """Mark the strip unavailable once it stops advertising."""
+        # the next advertisement brings the strip back
+        advertisements.reset()
+        _on_strip_state_change()
+
+    entry.async_on_unload(
+        bluetooth.async_track_unavailable(
+            hass, _async_unavailable, address.upper(), connectable=True
+        )
+    )
+
+    async_setup_prewarm(hass, entry)
 
     # Attach device info
     if ble_device is not None:
-        await led_strip.update_device(ble_device.device, ble_device.advertisement)
-    else:
-        # force refresh with no device
-        coordinator.refresh_state()
+        connections.async_update_advertisement(led_strip, ble_device)
+    coordinator.refresh_state()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -125,3 +219,11 @@ async def async_unload_entry(
     # disconnect
     await entry.runtime_data.device.disconnect()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: DaybetterLedStripConfigEntry,
+) -> None:
+    """Forget the cached state of a removed strip."""
+    async_get_state_cache(hass).async_remove(entry.data[CONF_ADDRESS])
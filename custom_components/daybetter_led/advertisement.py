@@ -0,0 +1,55 @@
+"""Advertisement filtering for daybetter_led_strip."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+
+
+class DaybetterLedStripAdvertisementFilter:
+    """
+    Drop advertisements that would not change anything for a strip.
+
+    Strips advertise several times a second. Packets with the same payload
+    from the same adapter are dropped, and RSSI-only changes are accepted at
+    most once per interval and only when they exceed the hysteresis.
+    """
+
+    def __init__(self, rssi_interval: float, rssi_hysteresis: int) -> None:
+        """Initialize the filter."""
+        self._rssi_interval = rssi_interval
+        self._rssi_hysteresis = rssi_hysteresis
+        self._payload: tuple[Any, ...] | None = None
+        self._rssi = 0
+        self._rssi_time = 0.0
+
+    def reset(self) -> None:
+        """Accept the next advertisement regardless of its contents."""
+        self._payload = None
+
+    def accept(self, service_info: BluetoothServiceInfoBleak) -> bool:
+        """Return whether the advertisement should be processed."""
+        payload = (
+            service_info.source,
+            service_info.connectable,
+            service_info.name,
+            service_info.manufacturer_data,
+            service_info.service_data,
+            service_info.service_uuids,
+        )
+        rssi = service_info.rssi
+        now = service_info.time
+
+        if payload != self._payload:
+            self._payload = payload
+        elif (
+            abs(rssi - self._rssi) < self._rssi_hysteresis
+            or now - self._rssi_time < self._rssi_interval
+        ):
+            return False
+
+        self._rssi = rssi
+        self._rssi_time = now
+        return True
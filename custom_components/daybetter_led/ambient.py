@@ -0,0 +1,309 @@
+"""Ambient colors from images and video for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util.hass_dict import HassKey
+from PIL import Image
+
+from .commands import DaybetterLedStripCommand
+from .const import AMBIENT_GRID, AMBIENT_REGIONS, AMBIENT_SAMPLE_SIZE, DOMAIN
+from .streams import KIND_DIRECTORY, KIND_PIPE, async_open_stream
+
+if TYPE_CHECKING:
+    from daybetter_led_strip.util import RgbColor
+    from homeassistant.core import HomeAssistant
+
+    from .frames import Frames
+
+_LOGGER = logging.getLogger(__name__)
+
+EFFECT_AMBIENT = "ambient"
+
+type AmbientSourceKey = tuple[str, int | None, int | None, float, float]
+
+DATA_AMBIENT_SOURCES: HassKey[
+    dict[AmbientSourceKey, DaybetterLedStripAmbientSource]
+] = HassKey(f"{DOMAIN}_ambient_sources")
+
+
+def _region_weights() -> np.ndarray:
+    """Weights turning the grid cells into the average of every region."""
+    weights = np.zeros(
+        (len(AMBIENT_REGIONS), AMBIENT_GRID * AMBIENT_GRID), dtype=np.float32
+    )
+    for index, cells in enumerate(AMBIENT_REGIONS.values()):
+        for row, column in cells:
+            weights[index, row * AMBIENT_GRID + column] = 1 / len(cells)
+    return weights
+
+
+_REGION_WEIGHTS = _region_weights()
+
+
+class DaybetterLedStripAmbientAnalyzer:
+    """
+    Reduce frames to the average color of every region.
+
+    A frame is sampled down to a fixed size, summed into grid cells and the
+    regions are weighted sums of the cells, all on buffers allocated once.
+    Colors are blended with the previous frame by the smoothing factor.
+    """
+
+    def __init__(self, smoothing: float) -> None:
+        """Initialize the buffers."""
+        width, height = AMBIENT_SAMPLE_SIZE
+        self._smoothing = smoothing
+        self._sample = np.empty((height, width, 3), dtype=np.float32)
+        self._cells = np.empty((AMBIENT_GRID, AMBIENT_GRID, 3), dtype=np.float32)
+        self._regions = np.empty((len(AMBIENT_REGIONS), 3), dtype=np.float32)
+        self._colors = np.zeros((len(AMBIENT_REGIONS), 3), dtype=np.float32)
+        self._first = True
+        # rows and columns sampled from raw frames of the last size seen
+        self._raw_shape: tuple[int, int] | None = None
+        self._raw_pixels: tuple[np.ndarray, np.ndarray] | None = None
+
+    def analyze_raw(self, frame: np.ndarray) -> dict[str, RgbColor]:
+        """Analyze a frame of shape (height, width, 3), sampled evenly across it."""
+        if self._raw_pixels is None or frame.shape[:2] != self._raw_shape:
+            width, height = AMBIENT_SAMPLE_SIZE
+            self._raw_shape = frame.shape[:2]
+            # from the first to the last row and column, whatever the size
+            self._raw_pixels = np.ix_(
+                np.linspace(0, frame.shape[0] - 1, height).round().astype(np.intp),
+                np.linspace(0, frame.shape[1] - 1, width).round().astype(np.intp),
+            )
+        np.copyto(self._sample, frame[self._raw_pixels])
+        return self._reduce()
+
+    def analyze_image(self, image: Image.Image) -> dict[str, RgbColor]:
+        """Analyze a decoded image, scaled down by averaging."""
+        # JPEG is decoded at a fraction of its size
+        image.draft("RGB", AMBIENT_SAMPLE_SIZE)
+        image = image.convert("RGB").resize(AMBIENT_SAMPLE_SIZE, Image.Resampling.BOX)
+        np.copyto(self._sample, np.asarray(image))
+        return self._reduce()
+
+    def _reduce(self) -> dict[str, RgbColor]:
+        """Average the sampled frame into the regions."""
+        width, height = AMBIENT_SAMPLE_SIZE
+        cells = self._sample.reshape(
+            AMBIENT_GRID, height // AMBIENT_GRID, AMBIENT_GRID, width // AMBIENT_GRID, 3
+        )
+        cells.mean(axis=(1, 3), out=self._cells)
+        np.matmul(_REGION_WEIGHTS, self._cells.reshape(-1, 3), out=self._regions)
+        if self._first:
+            self._colors[:] = self._regions
+            self._first = False
+        else:
+            self._colors *= self._smoothing
+            self._colors += (1 - self._smoothing) * self._regions
+        return dict(
+            zip(
+                AMBIENT_REGIONS,
+                (tuple(color) for color in self._colors.round().astype(int).tolist()),
+                strict=True,
+            )
+        )
+
+
+class DaybetterLedStripAmbientSource:
+    """
+    Read and analyze one frame source for every strip following it.
+
+    Frames are decoded and reduced in the executor, once for all strips,
+    and the latest color of every region is kept for the frame streams to
+    pick up at their own rate. An image file is decoded again when it
+    changes, a directory follows its newest image, both checked at the
+    frame rate. A pipe carries raw RGB24 frames of a fixed size, read as
+    they arrive. The source is closed when the last strip stops following.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        path: str,
+        kind: str,
+        size: tuple[int, int] | None,
+        fps: float,
+        smoothing: float,
+    ) -> None:
+        """Initialize a source that isn't read yet."""
+        self._hass = hass
+        self.path = path
+        self.key: AmbientSourceKey = (path, *(size or (None, None)), fps, smoothing)
+        self._kind = kind
+        self._interval = 1 / fps
+        self._analyzer = DaybetterLedStripAmbientAnalyzer(smoothing)
+        self._buffer: bytearray | None = None
+        self._frame: np.ndarray | None = None
+        if size is not None:
+            width, height = size
+            self._buffer = bytearray(width * height * 3)
+            self._frame = np.frombuffer(self._buffer, dtype=np.uint8).reshape(
+                height, width, 3
+            )
+        # modification time of the last image decoded
+        self._decoded: tuple[str, int] | None = None
+        self._followers = 0
+        self._task: asyncio.Task[None] | None = None
+        self.colors: dict[str, RgbColor] = dict.fromkeys(AMBIENT_REGIONS, (0, 0, 0))
+
+    @property
+    def running(self) -> bool:
+        """Whether the source is still being read."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def async_follow(self) -> CALLBACK_TYPE:
+        """Start reading if needed. Returns a callback to stop following."""
+        self._followers += 1
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} ambient {self.path}"
+            )
+
+        @callback
+        def _unfollow() -> None:
+            self._followers -= 1
+            if self._followers == 0 and self._task is not None:
+                self._task.cancel()
+                # strips starting later get a fresh source
+                self._async_forget()
+
+        return _unfollow
+
+    async def _async_run(self) -> None:
+        """Read frames until a pipe ends or nobody follows the source."""
+        try:
+            if self._kind == KIND_PIPE:
+                await self._async_read_pipe()
+            else:
+                await self._async_poll_images()
+        except OSError as err:
+            _LOGGER.warning("Error reading frames from %s: %s", self.path, err)
+        except Exception:
+            _LOGGER.exception("Error analyzing frames from %s", self.path)
+        finally:
+            self._async_forget()
+
+    async def _async_read_pipe(self) -> None:
+        """Analyze every frame written to the pipe."""
+        hass = self._hass
+        file: BinaryIO | None = None
+        try:
+            file = await async_open_stream(hass, self.path)
+            while (
+                colors := await hass.async_add_executor_job(self._read_raw, file)
+            ) is not None:
+                self.colors = colors
+        finally:
+            if file is not None:
+                await hass.async_add_executor_job(file.close)
+
+    async def _async_poll_images(self) -> None:
+        """Analyze the image or the newest image of the directory when it changes."""
+        hass = self._hass
+        loop = hass.loop
+        next_frame = loop.time()
+        while True:
+            if (
+                colors := await hass.async_add_executor_job(self._read_image)
+            ) is not None:
+                self.colors = colors
+            next_frame += self._interval
+            if (delay := next_frame - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            else:
+                # decoding took longer than a frame
+                next_frame = loop.time()
+
+    def _read_raw(self, file: BinaryIO) -> dict[str, RgbColor] | None:
+        """Read and analyze the next raw frame, None at the end of the pipe."""
+        assert self._buffer is not None  # noqa: S101 pipes always have a size
+        assert self._frame is not None  # noqa: S101
+        view = memoryview(self._buffer)
+        read = 0
+        while read < len(view):
+            if not (count := file.readinto(view[read:])):
+                return None
+            read += count
+        return self._analyzer.analyze_raw(self._frame)
+
+    def _read_image(self) -> dict[str, RgbColor] | None:
+        """Decode and analyze the image if it changed since the last frame."""
+        path = self.path
+        if self._kind == KIND_DIRECTORY:
+            images: list[tuple[int, str]] = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # the writer may remove older images while they are listed
+                    with suppress(FileNotFoundError):
+                        if entry.is_file():
+                            images.append((entry.stat().st_mtime_ns, entry.path))
+            if not images:
+                return None
+            modified, path = max(images)
+        else:
+            modified = Path(path).stat().st_mtime_ns
+        if self._decoded == (path, modified):
+            return None
+        self._decoded = (path, modified)
+        try:
+            with Image.open(path) as image:
+                return self._analyzer.analyze_image(image)
+        except (OSError, ValueError) as err:
+            # the file may still be written
+            _LOGGER.debug("Can't decode %s: %s", path, err)
+            self._decoded = None
+            return None
+
+    @callback
+    def _async_forget(self) -> None:
+        """Stop sharing this source with strips starting to follow it."""
+        sources = self._hass.data.get(DATA_AMBIENT_SOURCES, {})
+        if sources.get(self.key) is self:
+            del sources[self.key]
+
+
+@callback
+def async_get_ambient_source(  # noqa: PLR0913
+    hass: HomeAssistant,
+    path: str,
+    kind: str,
+    size: tuple[int, int] | None,
+    fps: float,
+    smoothing: float,
+) -> DaybetterLedStripAmbientSource:
+    """Get the source shared by every strip following the same frames."""
+    sources = hass.data.setdefault(DATA_AMBIENT_SOURCES, {})
+    key: AmbientSourceKey = (path, *(size or (None, None)), fps, smoothing)
+    if (source := sources.get(key)) is None:
+        source = DaybetterLedStripAmbientSource(hass, path, kind, size, fps, smoothing)
+        sources[source.key] = source
+    return source
+
+
+def ambient_frames(
+    source: DaybetterLedStripAmbientSource,
+    region: str,
+    *,
+    color_correction: bool = True,
+) -> Frames:
+    """Follow the color of a region of a frame source until it ends."""
+    unfollow = source.async_follow()
+    try:
+        while source.running:
+            yield DaybetterLedStripCommand(
+                color=source.colors[region], color_correction=color_correction
+            )
+    finally:
+        unfollow()
@@ -0,0 +1,203 @@
+"""Audio-reactive frames for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .commands import DaybetterLedStripCommand
+from .const import DOMAIN
+from .streams import async_open_stream
+
+if TYPE_CHECKING:
+    from daybetter_led_strip.util import RgbColor
+    from homeassistant.core import HomeAssistant
+
+    from .frames import Frames
+
+_LOGGER = logging.getLogger(__name__)
+
+EFFECT_AUDIO = "audio"
+
+DATA_AUDIO_SOURCES: HassKey[
+    dict[tuple[str, int, int], DaybetterLedStripAudioSource]
+] = HassKey(f"{DOMAIN}_audio_sources")
+
+# Samples per analysis block, 23 ms at 44.1 kHz
+BLOCK_SIZE = 1024
+# Frequency bands in Hz shown as red, green and blue
+BANDS = ((20, 250), (250, 2000), (2000, 16000))
+# Per block decay of the band peaks the levels are relative to, so quiet
+# passages still move the lights
+PEAK_DECAY = 0.995
+# Smallest peak, 2% of a full scale sine, so quiet bands and silence stay
+# dark instead of amplifying noise
+PEAK_FLOOR = 0.02 * 32768 * BLOCK_SIZE / 4
+# Weight of the newest block in the levels
+LEVEL_SMOOTHING = 0.5
+
+
+class DaybetterLedStripAudioAnalyzer:
+    """
+    Turn blocks of 16-bit PCM into a color and brightness.
+
+    Each band's energy is scaled by its recent peak and shown in one color
+    channel, the brightness follows the loudest band. The window and band
+    bins are computed once per source.
+    """
+
+    def __init__(self, sample_rate: int, channels: int) -> None:
+        """Initialize the analyzer for a PCM format."""
+        self.channels = channels
+        self.block_bytes = BLOCK_SIZE * channels * 2
+        self._window = np.hanning(BLOCK_SIZE).astype(np.float32)
+        self._samples = np.empty(BLOCK_SIZE, dtype=np.float32)
+        frequencies = np.fft.rfftfreq(BLOCK_SIZE, 1 / sample_rate)
+        # start of every band followed by its end, for reduceat, bands are
+        # cut off at the highest frequency of the sample rate
+        edges = np.minimum(np.ravel(BANDS), sample_rate / 2)
+        self._bins = np.searchsorted(frequencies, edges)
+        # bands above it stay dark, reduceat would return a single bin
+        self._empty = self._bins[0::2] == self._bins[1::2]
+        self._peaks = np.full(len(BANDS), PEAK_FLOOR)
+        self._levels = np.zeros(len(BANDS))
+
+    def analyze(self, data: bytes) -> tuple[RgbColor, int]:
+        """Analyze one block of interleaved little endian samples."""
+        pcm = np.frombuffer(data, dtype="<i2")
+        if self.channels > 1:
+            pcm = pcm.reshape(-1, self.channels).mean(axis=1)
+        np.multiply(pcm, self._window, out=self._samples)
+        spectrum = np.abs(np.fft.rfft(self._samples))
+        # sums from each band start to its end, every other one is a gap
+        energies = np.add.reduceat(spectrum, self._bins)[::2]
+        energies[self._empty] = 0
+        np.maximum(energies, self._peaks * PEAK_DECAY, out=self._peaks)
+        self._levels += LEVEL_SMOOTHING * (energies / self._peaks - self._levels)
+        red, green, blue = (np.clip(self._levels, 0, 1) * 255).round().astype(int)
+        brightness = round(float(self._levels.max()) * 100)
+        return (int(red), int(green), int(blue)), min(brightness, 100)
+
+
+class DaybetterLedStripAudioSource:
+    """
+    Read and analyze one PCM stream for every strip following it.
+
+    Blocks are read and analyzed in the executor, once for all strips, and
+    the latest result is kept for the frame streams to pick up at their own
+    rate. Regular files are paced to real time, pipes are read as the
+    audio arrives. The stream is closed when the last strip stops following.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, path: str, sample_rate: int, channels: int
+    ) -> None:
+        """Initialize a source that isn't read yet."""
+        self._hass = hass
+        self.path = path
+        self.key = (path, sample_rate, channels)
+        self._sample_rate = sample_rate
+        self._analyzer = DaybetterLedStripAudioAnalyzer(sample_rate, channels)
+        self._followers = 0
+        self._task: asyncio.Task[None] | None = None
+        self.color: RgbColor = (0, 0, 0)
+        self.brightness = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the stream is still being read."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def async_follow(self) -> CALLBACK_TYPE:
+        """Start reading if needed. Returns a callback to stop following."""
+        self._followers += 1
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} audio {self.path}"
+            )
+
+        @callback
+        def _unfollow() -> None:
+            self._followers -= 1
+            if self._followers == 0 and self._task is not None:
+                self._task.cancel()
+                # strips starting later get a fresh source
+                self._async_forget()
+
+        return _unfollow
+
+    async def _async_run(self) -> None:
+        """Read blocks until the stream ends or nobody follows it."""
+        hass = self._hass
+        loop = hass.loop
+        block_time = BLOCK_SIZE / self._sample_rate
+        file: BinaryIO | None = None
+        try:
+            file = await async_open_stream(hass, self.path)
+            next_block = loop.time()
+            while (
+                result := await hass.async_add_executor_job(self._read_block, file)
+            ) is not None:
+                self.color, self.brightness = result
+                next_block += block_time
+                if (delay := next_block - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # audio from a pipe arrives in real time
+                    next_block = loop.time()
+        except OSError as err:
+            _LOGGER.warning("Error reading audio from %s: %s", self.path, err)
+        except Exception:
+            _LOGGER.exception("Error analyzing audio from %s", self.path)
+        finally:
+            if file is not None:
+                await hass.async_add_executor_job(file.close)
+            self._async_forget()
+
+    @callback
+    def _async_forget(self) -> None:
+        """Stop sharing this source with strips starting to follow it."""
+        sources = self._hass.data.get(DATA_AUDIO_SOURCES, {})
+        if sources.get(self.key) is self:
+            del sources[self.key]
+
+    def _read_block(self, file: BinaryIO) -> tuple[RgbColor, int] | None:
+        """Read and analyze the next block, None at the end of the stream."""
+        data = file.read(self._analyzer.block_bytes)
+        if len(data) < self._analyzer.block_bytes:
+            return None
+        return self._analyzer.analyze(data)
+
+
+@callback
+def async_get_audio_source(
+    hass: HomeAssistant, path: str, sample_rate: int, channels: int
+) -> DaybetterLedStripAudioSource:
+    """Get the source shared by every strip following a stream."""
+    sources = hass.data.setdefault(DATA_AUDIO_SOURCES, {})
+    if (source := sources.get((path, sample_rate, channels))) is None:
+        source = DaybetterLedStripAudioSource(hass, path, sample_rate, channels)
+        sources[source.key] = source
+    return source
+
+
+def audio_frames(
+    source: DaybetterLedStripAudioSource, *, color_correction: bool = True
+) -> Frames:
+    """Follow the color and brightness of an audio source until it ends."""
+    unfollow = source.async_follow()
+    try:
+        while source.running:
+            yield DaybetterLedStripCommand(
+                color=source.color,
+                brightness=source.brightness,
+                color_correction=color_correction,
+            )
+    finally:
+        unfollow()
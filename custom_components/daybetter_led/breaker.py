@@ -0,0 +1,172 @@
+"""Circuit breaker for unreachable daybetter_led_strip strips."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from .connection import async_get_connection_manager
+from .const import CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT
+from .profiler import async_get_profiler
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .metrics import DaybetterLedStripMetrics
+    from .models import DaybetterLedStripConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive failed commands that open the breaker, each one was already
+# retried by the command queue
+FAILURE_THRESHOLD = 3
+# Seconds until the first probe, doubled after every failed probe
+BASE_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+# Fraction of the backoff randomized, so strips that failed together don't
+# probe together
+BACKOFF_JITTER = 0.2
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class DaybetterLedStripCircuitBreaker:
+    """
+    Stop sending commands to a strip that keeps failing.
+
+    After enough consecutive failures the breaker opens and commands fail
+    right away instead of waiting for connection attempts. A probe connects
+    in the background after an exponentially growing backoff, closing the
+    breaker when it succeeds. Commands fail fast until then.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: DaybetterLedStripConfigEntry,
+        metrics: DaybetterLedStripMetrics,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self._hass = hass
+        self._entry = entry
+        self._metrics = metrics
+        self.state = BreakerState.CLOSED
+        # consecutive failed commands
+        self._failures = 0
+        # openings since the last success, doubling the backoff
+        self._trips = 0
+        self._cancel_probe: CALLBACK_TYPE | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def closed(self) -> bool:
+        """Whether commands are sent to the strip."""
+        return self.state is BreakerState.CLOSED
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back when the breaker opens or closes."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_record_success(self) -> None:
+        """Reset the failures after a command reached the strip."""
+        self._failures = 0
+        self._trips = 0
+        if self.state is not BreakerState.CLOSED:
+            _LOGGER.debug("%s: circuit closed", self._entry.title)
+            self._set_state(BreakerState.CLOSED)
+
+    @callback
+    def async_record_failure(self) -> None:
+        """Count a failed command, opening the breaker at the threshold."""
+        self._failures += 1
+        if self.state is BreakerState.CLOSED and self._failures >= FAILURE_THRESHOLD:
+            self._async_open()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop probing."""
+        if self._cancel_probe is not None:
+            self._cancel_probe()
+            self._cancel_probe = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the breaker for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "trips": self._trips,
+        }
+
+    @callback
+    def _async_open(self) -> None:
+        """Fail fast and probe after the backoff."""
+        backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2**self._trips)
+        backoff *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)  # noqa: S311 not security related
+        self._trips += 1
+        self._metrics.breaker_trips += 1
+        _LOGGER.debug(
+            "%s: circuit open, probing in %.1f seconds", self._entry.title, backoff
+        )
+        self._cancel_probe = async_call_later(
+            self._hass,
+            backoff,
+            HassJob(self._async_start_probe, cancel_on_shutdown=True),
+        )
+        self._set_state(BreakerState.OPEN)
+
+    @callback
+    def _async_start_probe(self, _now: object) -> None:
+        self._cancel_probe = None
+        self._set_state(BreakerState.HALF_OPEN)
+        task = self._entry.async_create_background_task(
+            self._hass, self._async_run_probe(), f"{self._entry.title} probe"
+        )
+        async_get_profiler(self._hass).track_task("probe", task)
+
+    async def _async_run_probe(self) -> None:
+        """Close the breaker if the strip can be reached, else back off further."""
+        try:
+            reachable = await self._async_probe()
+        except Exception:  # noqa: BLE001 any failure keeps the breaker open
+            _LOGGER.debug("%s: probe failed", self._entry.title, exc_info=True)
+            reachable = False
+        if reachable:
+            self.async_record_success()
+        else:
+            self._async_open()
+
+    async def _async_probe(self) -> bool:
+        """Connect to the strip, if it is advertising at all."""
+        device = self._entry.runtime_data.device
+        if not bluetooth.async_address_present(
+            self._hass, device.address.upper(), connectable=True
+        ):
+            return False
+        async with asyncio.timeout(
+            self._entry.options.get(CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT)
+        ):
+            return await async_get_connection_manager(self._hass).async_prewarm(
+                device, 0
+            )
+
+    @callback
+    def _set_state(self, state: BreakerState) -> None:
+        self.state = state
+        for update_callback in list(self._listeners):
+            update_callback()
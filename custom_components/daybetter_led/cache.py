@@ -0,0 +1,123 @@
+"""Persistent state cache for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import logging
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from daybetter_led_strip.const import Effect
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from daybetter_led_strip import DaybetterLedStrip
+    from homeassistant.core import HomeAssistant
+
+    from .models import DaybetterLedStripState
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_CACHE: HassKey[DaybetterLedStripStateCache] = HassKey(
+    f"{DOMAIN}_state_cache"
+)
+
+STORAGE_KEY = f"{DOMAIN}.state_cache"
+STORAGE_VERSION = 1
+# Seconds to collect changes of all strips into one write
+SAVE_DELAY = 10
+
+
+@callback
+def async_get_state_cache(hass: HomeAssistant) -> DaybetterLedStripStateCache:
+    """Get the integration-wide state cache, creating it if needed."""
+    if (cache := hass.data.get(DATA_STATE_CACHE)) is None:
+        cache = hass.data[DATA_STATE_CACHE] = DaybetterLedStripStateCache(hass)
+    return cache
+
+
+class DaybetterLedStripStateCache:
+    """
+    Last confirmed state of every strip, kept across restarts.
+
+    The strips don't report their state, so after a restart only the cache
+    knows it. It is the only place the state is restored from, entities
+    show it through the coordinator like any other state. All strips share
+    one file which is read once at startup and written at most once per
+    save delay.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty cache."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._strips: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Read the cache from disk."""
+        if (data := await self._store.async_load()) is not None:
+            self._strips = data
+
+    @callback
+    def async_get(self, address: str) -> dict[str, Any] | None:
+        """Get the cached state of a strip."""
+        return self._strips.get(address)
+
+    @callback
+    def async_restore(self, device: DaybetterLedStrip) -> bool | None:
+        """
+        Fill in the state the strip hasn't reported yet from the cache.
+
+        Color, brightness and effect become the confirmed state of the
+        device, so redundant writes are detected from the first command.
+        Power may have been changed with the remote while Home Assistant was
+        down and isn't applied to the device, it is returned instead.
+        """
+        if (cached := self._strips.get(device.address)) is None:
+            return None
+        # fresh data from the strip wins
+        if device.color is None and device.effect is None:
+            if (color := cached.get("color")) is not None:
+                device.color = tuple(color)
+            elif (effect := cached.get("effect")) is not None:
+                with suppress(ValueError):
+                    device.effect = Effect(effect)
+        if device.brightness is None:
+            device.brightness = cached.get("brightness")
+        return cached.get("on")
+
+    @callback
+    def async_update(
+        self,
+        address: str,
+        state: DaybetterLedStripState,
+        source: str | None,
+    ) -> None:
+        """Cache the state of a strip if it changed."""
+        cached = self._strips.get(address, {})
+        data = {
+            # keep the last known value while the strip doesn't report one
+            "on": state.on if state.on is not None else cached.get("on"),
+            "color": list(state.color) if state.color is not None else None,
+            "brightness": state.brightness,
+            "effect": int(state.effect) if state.effect is not None else None,
+            "source": source if source is not None else cached.get("source"),
+        }
+        if data == cached:
+            return
+        self._strips[address] = data
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, address: str) -> None:
+        """Forget a removed strip."""
+        if self._strips.pop(address, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return self._strips
@@ -0,0 +1,114 @@
+"""Color calibration lookup tables for daybetter_led_strip."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from daybetter_led_strip.const import COMMAND_COLOR
+from daybetter_led_strip.util import (
+    BLUE_ADJUSTMNET,
+    GAMMA_CORRECTION,
+    GREEN_ADJUSTMENT,
+    RED_ADJUSTMENT,
+)
+
+from .const import (
+    CONF_COLOR_CORRECTION,
+    CONF_GAMMA,
+    CONF_WHITE_BALANCE_BLUE,
+    CONF_WHITE_BALANCE_GREEN,
+    CONF_WHITE_BALANCE_RED,
+    DEFAULT_GAMMA,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import Any
+
+    from daybetter_led_strip import DaybetterLedStrip
+    from daybetter_led_strip.util import RgbColor
+
+# Manually calibrated by the library
+DEFAULT_WHITE_BALANCE = (RED_ADJUSTMENT, GREEN_ADJUSTMENT, BLUE_ADJUSTMNET)
+
+IDENTITY = bytes(range(256))
+
+
+@lru_cache
+def build_lut(gamma: float, balance: int) -> bytes:
+    """
+    Build the 256 entry table for one channel.
+
+    A gamma of 0 uses the library's calibrated curve. Tables are shared by
+    all strips with the same calibration.
+    """
+    if gamma:
+        curve = [round(255 * (value / 255) ** gamma) for value in range(256)]
+    else:
+        curve = GAMMA_CORRECTION
+    return bytes(min(255, level * balance // 255) for level in curve)
+
+
+class DaybetterLedStripColorPipeline:
+    """
+    Convert requested colors to the values written to a strip.
+
+    Gamma and white balance are applied with one prebuilt table per channel,
+    so converting a color is three lookups. Colors are converted as each
+    write is planned, since frames are generated one at a time and every
+    strip has its own calibration. With the default calibration the result
+    matches the library's own color correction.
+    """
+
+    __slots__ = ("_luts", "enabled")
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        gamma: float = DEFAULT_GAMMA,
+        white_balance: RgbColor = DEFAULT_WHITE_BALANCE,
+    ) -> None:
+        """Build the tables for a calibration."""
+        self.enabled = enabled
+        self._luts = (
+            tuple(build_lut(gamma, balance) for balance in white_balance)
+            if enabled
+            else (IDENTITY, IDENTITY, IDENTITY)
+        )
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> DaybetterLedStripColorPipeline:
+        """Build the pipeline configured in the config entry options."""
+        return cls(
+            enabled=options.get(CONF_COLOR_CORRECTION, True),
+            gamma=options.get(CONF_GAMMA, DEFAULT_GAMMA),
+            white_balance=(
+                options.get(CONF_WHITE_BALANCE_RED, DEFAULT_WHITE_BALANCE[0]),
+                options.get(CONF_WHITE_BALANCE_GREEN, DEFAULT_WHITE_BALANCE[1]),
+                options.get(CONF_WHITE_BALANCE_BLUE, DEFAULT_WHITE_BALANCE[2]),
+            ),
+        )
+
+    def convert(self, color: RgbColor) -> RgbColor:
+        """Convert a single color."""
+        red, green, blue = self._luts
+        return (
+            red[min(255, max(0, color[0]))],
+            green[min(255, max(0, color[1]))],
+            blue[min(255, max(0, color[2]))],
+        )
+
+
+async def async_write_color(
+    device: DaybetterLedStrip, color: RgbColor, converted: RgbColor
+) -> None:
+    """
+    Write a converted color while tracking the requested one.
+
+    The library's set_color would store the converted color as the strip
+    state once acked, so the requested color is kept as pending instead.
+    """
+    device.pending_color = color
+    await device._write_led_control(COMMAND_COLOR, bytes(converted))  # noqa: SLF001
@@ -0,0 +1,448 @@
+"""Coalescing command pipeline for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.components import bluetooth
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from daybetter_led_strip import DaybetterLedStrip
+    from daybetter_led_strip.const import Effect
+    from daybetter_led_strip.util import RgbColor
+    from homeassistant.core import Context, HomeAssistant
+
+    from .breaker import DaybetterLedStripCircuitBreaker
+    from .color import DaybetterLedStripColorPipeline
+    from .connection import DaybetterLedStripConnectionManager
+    from .metrics import DaybetterLedStripMetrics
+    from .models import DaybetterLedStripConfigEntry
+
+from .color import async_write_color
+from .const import (
+    CONF_COMMAND_TIMEOUT,
+    CONF_DEBOUNCE,
+    CONF_WRITE_BURST,
+    CONF_WRITE_RATE,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_WRITE_BURST,
+    DEFAULT_WRITE_RATE,
+    DOMAIN,
+    Priority,
+)
+from .profiler import async_get_profiler
+
+_LOGGER = logging.getLogger(__name__)
+
+# Attempts per command, as long as the command timeout allows
+MAX_ATTEMPTS = 3
+# Seconds before the first retry, doubled for each further one and jittered
+RETRY_DELAY = 0.25
+
+
+@dataclass(slots=True)
+class DaybetterLedStripCommand:
+    """Requested attribute changes for a single strip."""
+
+    power: bool | None = None
+    brightness: int | None = None
+    color: RgbColor | None = None
+    color_correction: bool = True
+    effect: Effect | None = None
+
+    def merge(self, other: DaybetterLedStripCommand) -> None:
+        """Fold a newer command into this one, last write wins per attribute."""
+        if other.power is not None:
+            self.power = other.power
+        if other.brightness is not None:
+            self.brightness = other.brightness
+        # color and effect are mutually exclusive on the device
+        if other.color is not None:
+            self.color = other.color
+            self.color_correction = other.color_correction
+            self.effect = None
+        if other.effect is not None:
+            self.effect = other.effect
+            self.color = None
+
+
+def context_priority(context: Context | None) -> Priority:
+    """Get the lane of a service call, people go before automations."""
+    if context is not None and context.user_id is not None:
+        return Priority.INTERACTIVE
+    return Priority.AUTOMATION
+
+
+class TokenBucket:
+    """Token bucket limiting how often writes are sent to a strip."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket. A rate of 0 disables the limit."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = 0.0
+
+    def delay(self) -> float:
+        """Seconds until a token is available, 0 if one is available now."""
+        if self._rate <= 0:
+            return 0
+        now = asyncio.get_running_loop().time()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        return max(0, (1 - self._tokens) / self._rate)
+
+    def take(self) -> None:
+        """Take a token, going into debt if none is available."""
+        if self._rate > 0:
+            self._tokens -= 1
+
+    async def async_acquire(self, priority: Priority = Priority.AUTOMATION) -> None:
+        """Wait until a token is available and take it."""
+        # Interactive writes go out right away and delay the later ones
+        while priority is not Priority.INTERACTIVE:
+            if (delay := self.delay()) <= 0:
+                break
+            await asyncio.sleep(delay)
+        self.take()
+
+
+class DaybetterLedStripCommandQueue:
+    """
+    Per-strip queue that merges bursts of commands into as few writes as possible.
+
+    Commands submitted while a batch is being written, debounced or rate
+    limited are merged and sent together as the next batch, so superseded
+    intermediate values are dropped and the final one is always delivered.
+
+    A batch is retried a few times within the command timeout. Failed
+    batches feed the circuit breaker, and while it is open batches fail
+    right away.
+
+    Commands are sent on priority lanes. A batch takes the highest priority
+    of its commands, interactive batches skip the rate limit, and pending
+    background frames are dropped when any other command arrives. A lower
+    priority batch being written is not retried while a higher one waits.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        entry: DaybetterLedStripConfigEntry,
+        device: DaybetterLedStrip,
+        connections: DaybetterLedStripConnectionManager,
+        colors: DaybetterLedStripColorPipeline,
+        metrics: DaybetterLedStripMetrics,
+        breaker: DaybetterLedStripCircuitBreaker,
+    ) -> None:
+        """Initialize an empty queue."""
+        self._hass = hass
+        self._entry = entry
+        self._device = device
+        self._connections = connections
+        self._colors = colors
+        self._metrics = metrics
+        self._breaker = breaker
+        self._timeout = entry.options.get(CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT)
+        self._bucket = TokenBucket(
+            entry.options.get(CONF_WRITE_RATE, DEFAULT_WRITE_RATE),
+            entry.options.get(CONF_WRITE_BURST, DEFAULT_WRITE_BURST),
+        )
+        # seconds
+        self._debounce = entry.options.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE) / 1000
+        self._last_submitted = 0.0
+        self._pending: DaybetterLedStripCommand | None = None
+        self._priority = Priority.BACKGROUND
+        self._waiters: list[asyncio.Future[None]] = []
+        # wakes the flush task to reconsider the pending batch
+        self._wakeup = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+        # timeout of the command being written, started once it holds a slot
+        self._deadline: asyncio.Timeout | None = None
+        # whether an attempt of the current command failed or was writing
+        self._failed = False
+        self._writing = False
+
+    async def async_send(
+        self,
+        command: DaybetterLedStripCommand,
+        priority: Priority = Priority.AUTOMATION,
+    ) -> None:
+        """Queue a command and wait until the batch containing it is written."""
+        if (
+            self._pending is not None
+            and self._priority is Priority.BACKGROUND
+            and priority is not Priority.BACKGROUND
+        ):
+            # frames are superseded by any other command
+            self._async_drop_pending()
+        if self._pending is None:
+            # copy so merging never mutates the caller's command
+            self._pending = replace(command)
+            self._priority = priority
+        else:
+            self._pending.merge(command)
+            self._priority = min(self._priority, priority)
+        submitted = self._last_submitted = self._hass.loop.time()
+        self._wakeup.set()
+
+        waiter = self._hass.loop.create_future()
+        self._waiters.append(waiter)
+        metrics = self._metrics
+        metrics.queue_depth = len(self._waiters)
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._entry.async_create_background_task(
+                self._hass,
+                self._async_flush(),
+                f"{self._device.address} command flush",
+            )
+            async_get_profiler(self._hass).track_task("command_flush", self._flush_task)
+
+        await waiter
+        metrics.command_latency.record(self._hass.loop.time() - submitted)
+
+    @callback
+    def _async_drop_pending(self) -> None:
+        """Drop the pending batch, its callers return as if it was written."""
+        self._metrics.dropped_frames += 1
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._pending = None
+        self._waiters = []
+
+    async def _async_wait_turn(self) -> None:
+        """Wait out the debounce and rate limit of the pending batch."""
+        loop = self._hass.loop
+        while True:
+            # Trailing edge debounce: wait until submissions settle. Turning
+            # off is never debounced.
+            delay = 0.0
+            if self._pending is not None and self._pending.power is not False:
+                delay = self._last_submitted + self._debounce - loop.time()
+            if delay <= 0:
+                if self._priority is Priority.INTERACTIVE:
+                    self._bucket.take()
+                    return
+                if (delay := self._bucket.delay()) <= 0:
+                    self._bucket.take()
+                    return
+            # Anything submitted while waiting is merged into this batch and
+            # may move it to a faster lane
+            self._wakeup.clear()
+            with suppress(TimeoutError):
+                async with asyncio.timeout(delay):
+                    await self._wakeup.wait()
+
+    async def _async_flush(self) -> None:
+        """Write pending batches until the queue is empty."""
+        waiters: list[asyncio.Future[None]] = []
+        try:
+            while self._pending is not None:
+                await self._async_wait_turn()
+
+                command = self._pending
+                priority = self._priority
+                waiters = self._waiters
+                self._pending = None
+                self._waiters = []
+                self._metrics.queue_depth = 0
+                try:
+                    await self._async_write(command, priority)
+                except Exception as err:  # noqa: BLE001 handed to the callers
+                    self._metrics.write_failures += 1
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(err)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+        except asyncio.CancelledError:
+            for waiter in (*waiters, *self._waiters):
+                waiter.cancel()
+            raise
+
+    def _plan(self, command: DaybetterLedStripCommand) -> tuple[list[Write], int]:
+        """
+        Turn a merged command into the fewest device writes.
+
+        Also returns the number of attributes skipped because the strip is
+        already in the requested state.
+        """
+        device = self._device
+        skipped = 0
+
+        def changed(value: object, pending: object, confirmed: object) -> bool:
+            nonlocal skipped
+            # Writes that are still waiting for an ack may be overwritten by
+            # this one, so they can't be diffed against the confirmed state
+            if pending is None and confirmed == value:
+                skipped += 1
+                return False
+            return True
+
+        # The device holds the last state it confirmed. Color, brightness and
+        # effect may come from the state cache, power only from the strip.
+        if command.power is False:
+            # Nothing else is visible once the strip is off
+            if changed(False, device.pending_power, device.power):  # noqa: FBT003
+                return [partial(device.set_power, on=False)], skipped
+            return [], skipped
+
+        writes: list[Write] = []
+        # The protocol has no combined command, so power can only be folded
+        # away when the strip is already on
+        if command.power and changed(True, device.pending_power, device.power):  # noqa: FBT003
+            writes.append(partial(device.set_power, on=True))
+        if command.brightness is not None and changed(
+            command.brightness, device.pending_brightness, device.brightness
+        ):
+            writes.append(partial(device.set_brightness, command.brightness))
+        if command.color is not None:
+            if changed(command.color, device.pending_color, device.color):
+                writes.append(
+                    partial(
+                        async_write_color,
+                        device,
+                        command.color,
+                        self._colors.convert(command.color)
+                        if command.color_correction
+                        else command.color,
+                    )
+                )
+        elif command.effect is not None and changed(
+            command.effect, device.pending_effect, device.effect
+        ):
+            writes.append(partial(device.set_effect, command.effect))
+
+        if not writes:
+            _LOGGER.debug("%s: skipping redundant command", device.address)
+        return writes, skipped
+
+    async def _async_write(
+        self, command: DaybetterLedStripCommand, priority: Priority
+    ) -> None:
+        """Send a merged command to the device within the command timeout."""
+        writes, skipped = self._plan(command)
+        # counted once per command, retries plan again
+        self._metrics.skipped_writes += skipped
+        if not writes:
+            return
+
+        device = self._device
+        # Fail fast while the breaker is open or the strip isn't advertising
+        if not self._breaker.closed or not (
+            device.connected
+            or bluetooth.async_address_present(
+                self._hass, device.address.upper(), connectable=True
+            )
+        ):
+            self._metrics.rejected_commands += 1
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="strip_unreachable",
+                translation_placeholders={"name": self._entry.title},
+            )
+
+        self._failed = self._writing = False
+        try:
+            # Waiting for a slot held by other strips isn't part of the timeout
+            async with asyncio.timeout(None) as deadline:
+                self._deadline = deadline
+                await self._async_write_with_retries(command, priority, writes)
+        except TimeoutError as err:
+            self._metrics.timeouts += 1
+            # a connect cut short by the timeout isn't the strip's fault
+            if self._failed or self._writing:
+                self._breaker.async_record_failure()
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="command_timeout",
+                translation_placeholders={
+                    "name": self._entry.title,
+                    "timeout": str(self._timeout),
+                },
+            ) from err
+        except HomeAssistantError:
+            self._breaker.async_record_failure()
+            raise
+        finally:
+            self._deadline = None
+        self._breaker.async_record_success()
+
+    @callback
+    def _async_start_deadline(self) -> None:
+        """Start the command timeout when the first attempt gets a slot."""
+        if self._deadline is not None and self._deadline.when() is None:
+            self._deadline.reschedule(self._hass.loop.time() + self._timeout)
+
+    async def _async_write_with_retries(
+        self,
+        command: DaybetterLedStripCommand,
+        priority: Priority,
+        writes: list[Write],
+    ) -> None:
+        """Write, retrying with exponential backoff and jitter."""
+        attempt = 1
+        while True:
+            try:
+                await self._async_write_once(priority, writes)
+            except HomeAssistantError:
+                self._failed = True
+                # don't hold up a more important batch
+                if attempt >= MAX_ATTEMPTS or (
+                    self._pending is not None and self._priority < priority
+                ):
+                    raise
+            else:
+                return
+            delay = RETRY_DELAY * 2 ** (attempt - 1)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))  # noqa: S311 not security related
+            attempt += 1
+            self._metrics.retries += 1
+            # writes that went through before the failure may be acked by now
+            writes, _skipped = self._plan(command)
+            if not writes:
+                return
+
+    async def _async_write_once(self, priority: Priority, writes: list[Write]) -> None:
+        """Connect and send the writes."""
+        device = self._device
+        async with self._connections.async_connection(
+            device, priority, self._async_start_deadline
+        ):
+            for index, write in enumerate(writes):
+                # The library drops writes to a disconnected strip silently
+                if not device.connected:
+                    raise HomeAssistantError(
+                        translation_domain=DOMAIN,
+                        translation_key="not_connected",
+                        translation_placeholders={"name": self._entry.title},
+                    )
+                # The first write of a batch already took a token in _async_flush
+                if index:
+                    await self._bucket.async_acquire(priority)
+                start = self._hass.loop.time()
+                self._writing = True
+                await write()
+                self._writing = False
+                self._metrics.write_latency.record(self._hass.loop.time() - start)
+
+
+type Write = Callable[[], Awaitable[None]]
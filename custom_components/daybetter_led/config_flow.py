@@ -9,18 +9,30 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_ADDRESS
+from homeassistant.config_entries import (
+    SOURCE_INTEGRATION_DISCOVERY,
+    ConfigFlow,
+    ConfigFlowResult,
+)
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
 from homeassistant.core import callback
+from homeassistant.helpers import selector
+from homeassistant.helpers.typing import DiscoveryInfoType
 
 from custom_components.daybetter_led.models import DaybetterLedStripConfigEntry
 from custom_components.daybetter_led.options_flow import DaybetterLedStripOptionsFlow
 
-from .const import DOMAIN
+from .const import CONF_ADDRESSES, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _title(name: str | None, address: str) -> str:
+    """Generate a title that tells strips with the same name apart."""
+    # the last two bytes of the address are enough to identify a strip on site
+    return f"{name or 'LED Strip'} {address[-5:].replace(':', '')}"
+
+
 class DaybetterLedStripConfigFlow(ConfigFlow, domain=DOMAIN):
     """Bluetooth autodiscovery config flow."""
 
@@ -40,59 +52,99 @@ class DaybetterLedStripConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info = discovery_info
         return await self.async_step_user()
 
+    async def async_step_integration_discovery(
+        self, discovery_info: DiscoveryInfoType
+    ) -> ConfigFlowResult:
+        """Create an entry for one of the other strips selected in the user step."""
+        address = discovery_info[CONF_ADDRESS]
+        # replaces a bluetooth discovery flow of the same strip
+        await self.async_set_unique_id(address, raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=_title(discovery_info[CONF_NAME], address),
+            data={CONF_ADDRESS: address},
+        )
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the user step to pick discovered device."""
+        """Handle the user step to pick discovered devices."""
         errors: dict[str, str] = {}
 
-        # user picked a device
-        if user_input is not None:
-            address = user_input[CONF_ADDRESS]
-            discovery_info = self._discovered_devices[address]
-            local_name = discovery_info.name
-            # use the address as unique id
-            await self.async_set_unique_id(
-                discovery_info.address, raise_on_progress=False
+        if user_input is not None and not user_input[CONF_ADDRESSES]:
+            errors["base"] = "no_devices_selected"
+        # user picked one or more devices
+        elif user_input is not None:
+            # drop strips that were configured while the form was open
+            addresses = set(user_input[CONF_ADDRESSES]).difference(
+                self._async_current_ids(include_ignore=False)
             )
-            self._abort_if_unique_id_configured()
+            if not addresses:
+                return self.async_abort(reason="already_configured")
+
+            first, *others = sorted(addresses)
+            # A flow creates a single entry, the other strips get one each
+            for address in others:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                        data={
+                            CONF_ADDRESS: address,
+                            CONF_NAME: self._discovered_devices[address].name,
+                        },
+                    ),
+                    f"{DOMAIN} add {address}",
+                )
 
+            # use the address as unique id
+            await self.async_set_unique_id(first, raise_on_progress=False)
+            self._abort_if_unique_id_configured()
             return self.async_create_entry(
-                title=local_name,
-                data={
-                    CONF_ADDRESS: discovery_info.address,
-                },
+                title=_title(self._discovered_devices[first].name, first),
+                data={CONF_ADDRESS: first},
             )
 
         if discovery := self._discovery_info:
             # If we came from bluetooth discovery, use only that device
             self._discovered_devices[discovery.address] = discovery
-        else:
+        elif not self._discovered_devices:
+            # scan once per flow, the form is shown again only on errors
             current_addresses = self._async_current_ids(include_ignore=False)
-            for discovery in async_discovered_service_info(self.hass):
-                if (
-                    # filter out already configured devices
-                    discovery.address in current_addresses
-                    or discovery.address in self._discovered_devices
-                    # make sure it's a Daybetter LED Strip
-                    or SERVICE_DISCOVERY not in discovery.service_uuids
-                ):
-                    continue
-                self._discovered_devices[discovery.address] = discovery
+            self._discovered_devices = {
+                discovery.address: discovery
+                for discovery in async_discovered_service_info(self.hass)
+                # make sure it's a Daybetter LED Strip
+                if SERVICE_DISCOVERY in discovery.service_uuids
+            }
+            # filter out already configured devices
+            for address in current_addresses & self._discovered_devices.keys():
+                del self._discovered_devices[address]
 
         if not self._discovered_devices:
             return self.async_abort(reason="no_devices_found")
 
         data_schema = vol.Schema(
             {
-                vol.Required(CONF_ADDRESS): vol.In(
-                    # Populate the dropdown with discovered devices
-                    {
-                        service_info.address: (
-                            f"{service_info.name} ({service_info.address})"
-                        )
-                        for service_info in self._discovered_devices.values()
-                    }
+                vol.Required(
+                    CONF_ADDRESSES,
+                    # all strips are selected, deselecting is faster on site
+                    default=list(self._discovered_devices),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        # Populate the list with discovered devices
+                        options=[
+                            selector.SelectOptionDict(
+                                value=address,
+                                label=f"{service_info.name} ({address})",
+                            )
+                            for address, service_info in sorted(
+                                self._discovered_devices.items()
+                            )
+                        ],
+                        multiple=True,
+                        mode=selector.SelectSelectorMode.LIST,
+                    )
                 ),
             }
         )
@@ -0,0 +1,364 @@
+"""Shared BLE connection manager for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from bisect import insort
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HassJob, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DEFAULT_MAX_CONNECTIONS, DOMAIN, Priority
+from .routing import DaybetterLedStripRouter
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from daybetter_led_strip import DaybetterLedStrip
+    from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+    from homeassistant.core import HomeAssistant
+
+    from .metrics import DaybetterLedStripMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CONNECTIONS: HassKey[DaybetterLedStripConnectionManager] = HassKey(
+    f"{DOMAIN}_connections"
+)
+
+
+@callback
+def async_get_connection_manager(
+    hass: HomeAssistant,
+) -> DaybetterLedStripConnectionManager:
+    """Get the integration-wide connection manager, creating it if needed."""
+    if (manager := hass.data.get(DATA_CONNECTIONS)) is None:
+        manager = hass.data[DATA_CONNECTIONS] = DaybetterLedStripConnectionManager(hass)
+    return manager
+
+
+@dataclass(slots=True)
+class _StripConnection:
+    """Connection bookkeeping for a single strip."""
+
+    device: DaybetterLedStrip
+    idle_timeout: float
+    metrics: DaybetterLedStripMetrics
+    # adapter or proxy the strip was last seen through
+    source: str | None = None
+    # number of callers currently using the connection
+    users: int = 0
+    # whether this strip counts against its adapter's connection limit
+    holds_slot: bool = False
+    last_used: float = 0.0
+    # pre-warmed connections are kept at least until then
+    warm_until: float = 0.0
+    cancel_idle: CALLBACK_TYPE | None = None
+    # disconnect in progress after the slot was given up
+    closing: asyncio.Task[None] | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    router: DaybetterLedStripRouter = field(default_factory=DaybetterLedStripRouter)
+
+
+class DaybetterLedStripConnectionManager:
+    """
+    Schedule BLE connections to strips across all config entries.
+
+    Each adapter or proxy gets a limited number of connection slots. Strips in
+    use keep their slot, idle strips are disconnected after their idle timeout
+    or evicted (least recently used first) when another strip needs the slot,
+    and the remaining callers wait by priority, then in FIFO order. Strips
+    seen by several adapters or proxies are connected through the best one,
+    chosen by a router per strip whenever it needs a slot.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_connections: int = DEFAULT_MAX_CONNECTIONS
+    ) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._max_connections = max_connections
+        self._strips: dict[str, _StripConnection] = {}
+        # priority, arrival order and future of the callers waiting for a slot
+        self._waiters: defaultdict[
+            str | None, list[tuple[Priority, int, asyncio.Future[None]]]
+        ] = defaultdict(list)
+        self._arrivals = itertools.count()
+
+    @callback
+    def async_register(
+        self,
+        device: DaybetterLedStrip,
+        idle_timeout: float,
+        metrics: DaybetterLedStripMetrics,
+    ) -> CALLBACK_TYPE:
+        """Start managing a strip. Returns a callback to stop managing it."""
+        strip = self._strips[device.address] = _StripConnection(
+            device=device, idle_timeout=idle_timeout, metrics=metrics
+        )
+        remove_listener = device.on_change(lambda: self._release_if_lost(strip))
+
+        @callback
+        def _unregister() -> None:
+            remove_listener()
+            if strip.cancel_idle is not None:
+                strip.cancel_idle()
+            self._strips.pop(device.address, None)
+            self._release(strip)
+
+        return _unregister
+
+    @callback
+    def async_update_advertisement(
+        self, device: DaybetterLedStrip, service_info: BluetoothServiceInfoBleak
+    ) -> None:
+        """
+        Attach the latest advertisement to a strip without connecting.
+
+        The library's update_device connects (or disconnects) on every
+        advertisement, which would bypass the slot limits.
+        """
+        device.advertisment_data = service_info.advertisement
+        if (strip := self._strips.get(device.address)) is None:
+            device.device = service_info.device
+            return
+
+        # the route is only chosen when the strip connects
+        strip.router.update(
+            service_info.source,
+            service_info.device,
+            service_info.rssi,
+            self._hass.loop.time(),
+        )
+
+    @callback
+    def async_get_source(self, device: DaybetterLedStrip) -> str | None:
+        """Get the adapter or proxy the strip was last seen through."""
+        if (strip := self._strips.get(device.address)) is None:
+            return None
+        return strip.source
+
+    @callback
+    def async_restore_route(self, device: DaybetterLedStrip, source: str) -> None:
+        """Prefer the adapter or proxy the strip was connected through before."""
+        if (strip := self._strips.get(device.address)) is not None:
+            strip.router.source = source
+
+    @callback
+    def async_get_routes(self, device: DaybetterLedStrip) -> dict[str, Any]:
+        """Get the paths to a strip and their scores, for diagnostics."""
+        if (strip := self._strips.get(device.address)) is None:
+            return {}
+        return strip.router.as_dict(self._hass.loop.time())
+
+    async def async_prewarm(self, device: DaybetterLedStrip, duration: float) -> bool:
+        """
+        Connect a strip ahead of its next command.
+
+        The connection is kept for at least the duration, or the idle timeout
+        if that is longer, and returns whether the strip is connected.
+        """
+        strip = self._strips[device.address]
+        strip.warm_until = max(strip.warm_until, self._hass.loop.time() + duration)
+        async with self.async_connection(device, Priority.BACKGROUND):
+            return device.connected
+
+    @asynccontextmanager
+    async def async_connection(
+        self,
+        device: DaybetterLedStrip,
+        priority: Priority = Priority.AUTOMATION,
+        on_slot: CALLBACK_TYPE | None = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold a connection to the strip, connecting if needed.
+
+        on_slot is called once the strip holds a slot, before connecting.
+        """
+        strip = self._strips[device.address]
+        loop = self._hass.loop
+        strip.users += 1
+        if strip.cancel_idle is not None:
+            strip.cancel_idle()
+            strip.cancel_idle = None
+
+        try:
+            async with strip.lock:
+                if not strip.holds_slot:
+                    self._async_route(strip)
+                    start = loop.time()
+                    await self._async_acquire_slot(strip, priority)
+                    strip.metrics.slot_wait.record(loop.time() - start)
+                if on_slot is not None:
+                    on_slot()
+                if strip.closing is not None:
+                    await asyncio.shield(strip.closing)
+                if not device.connected:
+                    start = loop.time()
+                    try:
+                        await device.connect()
+                    except asyncio.CancelledError:
+                        # the command ran out of time while connecting
+                        strip.router.record_connect(strip.source, success=False)
+                        strip.metrics.connect_failures += 1
+                        self._release(strip)
+                        raise
+                    strip.router.record_connect(strip.source, success=device.connected)
+                    if device.connected:
+                        strip.metrics.connects += 1
+                        strip.metrics.connect_time.record(loop.time() - start)
+                    else:
+                        _LOGGER.debug("%s: failed to connect", device.address)
+                        strip.metrics.connect_failures += 1
+                        self._release(strip)
+            yield
+        finally:
+            strip.users -= 1
+            strip.last_used = loop.time()
+            if strip.users == 0:
+                self._async_schedule_idle(strip)
+                # the slot can now be evicted by a waiting strip
+                self._wake(strip.source)
+
+    async def _async_acquire_slot(
+        self, strip: _StripConnection, priority: Priority
+    ) -> None:
+        """Wait until the strip's adapter has a free slot and take it."""
+        waiters = self._waiters[strip.source]
+        arrival = next(self._arrivals)
+        # wait behind strips of the same or a higher priority already queued
+        queued = bool(waiters) and waiters[0][0] <= priority
+        while True:
+            if not queued:
+                holders = [
+                    other
+                    for other in self._strips.values()
+                    if other.source == strip.source and other.holds_slot
+                ]
+                if len(holders) < self._max_connections:
+                    strip.holds_slot = True
+                    # more than one slot may have been freed
+                    self._wake(strip.source)
+                    return
+
+                idle = [other for other in holders if other.users == 0]
+                if idle:
+                    # hand the least recently used idle slot over, sparing
+                    # pre-warmed strips while others can go
+                    now = self._hass.loop.time()
+                    victim = min(
+                        idle,
+                        key=lambda other: (other.warm_until > now, other.last_used),
+                    )
+                    _LOGGER.debug(
+                        "%s: evicting idle %s",
+                        strip.device.address,
+                        victim.device.address,
+                    )
+                    victim.holds_slot = False
+                    strip.holds_slot = True
+                    await asyncio.shield(self._async_close(victim))
+                    return
+
+            # a strip that was woken but still found no slot keeps its place
+            entry = (priority, arrival, self._hass.loop.create_future())
+            insort(waiters, entry, key=lambda waiter: waiter[:2])
+            try:
+                await entry[2]
+            finally:
+                waiters.remove(entry)
+            queued = False
+
+    @callback
+    def _async_route(self, strip: _StripConnection) -> None:
+        """Point the strip at the best adapter or proxy that currently sees it."""
+        router = strip.router
+        now = self._hass.loop.time()
+        # Advertisements only carry the adapter or proxy they came through,
+        # the others are looked up once per connection instead of each time
+        for scanner_device in bluetooth.async_scanner_devices_by_address(
+            self._hass, strip.device.address.upper(), connectable=True
+        ):
+            router.update(
+                scanner_device.scanner.source,
+                scanner_device.ble_device,
+                scanner_device.advertisement.rssi,
+                now,
+            )
+        if (ble_device := router.select(now)) is None:
+            return
+        if strip.router.source != strip.source:
+            _LOGGER.debug(
+                "%s: routing through %s", strip.device.address, strip.router.source
+            )
+        strip.device.device = ble_device
+        strip.source = strip.router.source
+
+    @callback
+    def _async_schedule_idle(self, strip: _StripConnection) -> None:
+        """Disconnect the strip once it has been idle for its timeout."""
+        # 0 keeps the strip connected until its slot is needed
+        if strip.idle_timeout <= 0:
+            return
+        delay = max(strip.idle_timeout, strip.warm_until - self._hass.loop.time())
+
+        @callback
+        def _idle(_now: object) -> None:
+            strip.cancel_idle = None
+            if strip.users == 0 and strip.holds_slot:
+                self._release(strip)
+                self._async_close(strip)
+
+        strip.cancel_idle = async_call_later(
+            self._hass, delay, HassJob(_idle, cancel_on_shutdown=True)
+        )
+
+    @callback
+    def _async_close(self, strip: _StripConnection) -> asyncio.Task[None]:
+        """Disconnect a strip that no longer holds a slot."""
+        if strip.closing is None:
+
+            async def _async_disconnect() -> None:
+                try:
+                    await strip.device.disconnect()
+                finally:
+                    strip.closing = None
+
+            strip.closing = self._hass.async_create_background_task(
+                _async_disconnect(), f"{strip.device.address} disconnect"
+            )
+        return strip.closing
+
+    @callback
+    def _release_if_lost(self, strip: _StripConnection) -> None:
+        """Free the slot of a strip that disconnected on its own."""
+        if (
+            strip.holds_slot
+            and not strip.users
+            and strip.closing is None
+            and not strip.device.connected
+        ):
+            self._release(strip)
+
+    @callback
+    def _release(self, strip: _StripConnection) -> None:
+        """Give up the strip's slot and wake the next waiter."""
+        if strip.holds_slot:
+            strip.holds_slot = False
+            self._wake(strip.source)
+
+    @callback
+    def _wake(self, source: str | None) -> None:
+        """Let the first strip waiting on an adapter retry."""
+        for _priority, _arrival, waiter in self._waiters[source]:
+            if not waiter.done():
+                waiter.set_result(None)
+                return
@@ -1,6 +1,79 @@
 """Constants for the Daybetter LED Strip integration."""
 
+from enum import IntEnum
+
 DOMAIN = "daybetter_led"
 MANUFACTURER = "Daybetter"
 
+CONF_ADDRESSES = "addresses"
 CONF_COLOR_CORRECTION = "color_correction"
+CONF_OPTIMISTIC = "optimistic"
+CONF_WRITE_RATE = "write_rate"
+CONF_WRITE_BURST = "write_burst"
+CONF_DEBOUNCE = "debounce"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_RSSI_INTERVAL = "rssi_interval"
+CONF_RSSI_HYSTERESIS = "rssi_hysteresis"
+CONF_RSSI_SMOOTHING = "rssi_smoothing"
+CONF_GAMMA = "gamma"
+CONF_WHITE_BALANCE_RED = "white_balance_red"
+CONF_WHITE_BALANCE_GREEN = "white_balance_green"
+CONF_WHITE_BALANCE_BLUE = "white_balance_blue"
+CONF_PREWARM_ENTITIES = "prewarm_entities"
+CONF_PREWARM_DURATION = "prewarm_duration"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+
+DEFAULT_OPTIMISTIC = True
+# Writes per second, 0 disables rate limiting
+DEFAULT_WRITE_RATE = 10.0
+DEFAULT_WRITE_BURST = 4
+# Milliseconds
+DEFAULT_DEBOUNCE = 0
+# Seconds, 0 keeps the strip connected until another strip needs the slot
+DEFAULT_IDLE_TIMEOUT = 0
+# Concurrent connections per Bluetooth adapter or proxy
+DEFAULT_MAX_CONNECTIONS = 3
+# Seconds between RSSI-only advertisement updates
+DEFAULT_RSSI_INTERVAL = 30
+# dBm
+DEFAULT_RSSI_HYSTERESIS = 3
+# Number of RSSI samples averaged by the RSSI sensor
+DEFAULT_RSSI_SMOOTHING = 5
+# 0 uses the calibrated curve of the library
+DEFAULT_GAMMA = 0.0
+# Seconds a pre-warmed connection is kept
+DEFAULT_PREWARM_DURATION = 300
+# Rows and columns of the cells ambient frames are averaged into
+AMBIENT_GRID = 3
+# Pixels ambient frames are sampled down to, a multiple of the grid in both
+# directions
+AMBIENT_SAMPLE_SIZE = (48, 27)
+# Screen regions a strip can follow, as the grid cells they average
+AMBIENT_REGIONS: dict[str, tuple[tuple[int, int], ...]] = {
+    "full": tuple(
+        (row, column) for row in range(AMBIENT_GRID) for column in range(AMBIENT_GRID)
+    ),
+    "top": tuple((0, column) for column in range(AMBIENT_GRID)),
+    "bottom": tuple((AMBIENT_GRID - 1, column) for column in range(AMBIENT_GRID)),
+    "left": tuple((row, 0) for row in range(AMBIENT_GRID)),
+    "right": tuple((row, AMBIENT_GRID - 1) for row in range(AMBIENT_GRID)),
+    "center": ((1, 1),),
+    "top_left": ((0, 0),),
+    "top_right": ((0, AMBIENT_GRID - 1),),
+    "bottom_left": ((AMBIENT_GRID - 1, 0),),
+    "bottom_right": ((AMBIENT_GRID - 1, AMBIENT_GRID - 1),),
+}
+# Seconds a command may take once the strip holds a connection slot,
+# including connecting and retries
+DEFAULT_COMMAND_TIMEOUT = 5
+
+
+class Priority(IntEnum):
+    """Lane of a command or connection, lower values go first."""
+
+    # started by a person, e.g. from the dashboard
+    INTERACTIVE = 0
+    # automations, scripts and other integrations
+    AUTOMATION = 1
+    # frame streams, pre-warming and reconnect probes
+    BACKGROUND = 2
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
 from typing import TYPE_CHECKING
 
+from homeassistant.components import bluetooth
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
@@ -12,22 +12,65 @@ from .models import DaybetterLedStripState
 
 if TYPE_CHECKING:
     from .models import DaybetterLedStripConfigEntry
+    from .profiler import DaybetterLedStripProfiler
 
 
-class DaybetterLedStripCoordinator(DataUpdateCoordinator):
-    """Class to manage pushing data from device."""
+class DaybetterLedStripCoordinator(DataUpdateCoordinator[DaybetterLedStripState]):
+    """
+    Class to manage pushing data from device.
+
+    Entities pass the state fields they depend on as their coordinator
+    context and are only notified when one of those fields changes.
+    """
 
     config_entry: DaybetterLedStripConfigEntry
+    # fields changed by the last update, None notifies every listener
+    changed: frozenset[str] | None = None
+    # power from the state cache, shown until the strip reports its own
+    cached_power: bool | None = None
+    profiler: DaybetterLedStripProfiler
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners that depend on the changed fields."""
+        changed = self.changed
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or changed is None or not changed.isdisjoint(context):
+                # entity updates are named after their class
+                with self.profiler.measure(
+                    update_callback.__qualname__, self.config_entry.title
+                ):
+                    update_callback()
 
     @callback
     def refresh_state(self) -> None:
         """Refresh the state from the device and push to entities."""
+        with self.profiler.measure("refresh_state", self.config_entry.title):
+            self._refresh_state()
+
+    @callback
+    def _refresh_state(self) -> None:
+        runtime_data = self.config_entry.runtime_data
+        device = runtime_data.device
         state = DaybetterLedStripState(
-            connected=self.config_entry.runtime_data.device.connected,
-            on=self.config_entry.runtime_data.device.power,
-            rssi=self.config_entry.runtime_data.device.rssi,
-            color=self.config_entry.runtime_data.device.color,
-            brightness=self.config_entry.runtime_data.device.brightness,
-            effect=self.config_entry.runtime_data.device.effect,
+            connected=device.connected,
+            # idle strips are disconnected but still reachable, strips that
+            # keep failing are not until a probe reaches them
+            available=runtime_data.breaker.closed
+            and (
+                device.connected
+                or bluetooth.async_address_present(
+                    self.hass, device.address.upper(), connectable=True
+                )
+            ),
+            on=device.power if device.power is not None else self.cached_power,
+            rssi=device.rssi,
+            color=device.color,
+            brightness=device.brightness,
+            effect=device.effect,
         )
-        self.async_set_updated_data(asdict(state))
+        if not (changed := state.changed_fields(self.data)):
+            return
+        self.changed = changed
+        self.async_set_updated_data(state)
+        self.changed = None
@@ -0,0 +1,47 @@
+"""Diagnostics support for daybetter_led_strip."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_ADDRESS
+
+from .connection import async_get_connection_manager
+from .profiler import async_get_profiler
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .models import DaybetterLedStripConfigEntry
+
+TO_REDACT = {CONF_ADDRESS, "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: DaybetterLedStripConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    device = runtime_data.device
+    state = runtime_data.coordinator.data
+    connections = async_get_connection_manager(hass)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "state": asdict(state) if state is not None else None,
+        "connection": {
+            "source": connections.async_get_source(device),
+            "connected": device.connected,
+            "rssi": device.rssi,
+            "routes": connections.async_get_routes(device),
+        },
+        "frames": {
+            "running": runtime_data.frames.running,
+            "write_latency": round(runtime_data.frames.latency * 1000, 1),
+        },
+        "breaker": runtime_data.breaker.as_dict(),
+        "metrics": runtime_data.metrics.as_dict(),
+        # the last run of the profile service, for this strip
+        "profile": async_get_profiler(hass).as_dict(entry.title),
+    }
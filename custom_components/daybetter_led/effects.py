@@ -0,0 +1,165 @@
+"""Host-driven effects for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import colorsys
+import math
+import random
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING
+
+from .commands import DaybetterLedStripCommand
+
+if TYPE_CHECKING:
+    from daybetter_led_strip.util import RgbColor
+
+    from .frames import Frames
+
+EFFECT_RAINBOW = "rainbow"
+EFFECT_BREATHING = "breathing"
+EFFECT_CANDLE = "candle"
+
+# Colors cycled through by the palette effects, in order
+PALETTES: dict[str, tuple[RgbColor, ...]] = {
+    "palette_sunset": ((255, 94, 0), (255, 0, 72), (120, 0, 160), (255, 170, 0)),
+    "palette_ocean": ((0, 30, 255), (0, 160, 255), (0, 255, 170), (0, 80, 160)),
+    "palette_forest": ((20, 120, 0), (120, 200, 0), (0, 90, 40), (200, 160, 0)),
+}
+
+HOST_EFFECTS = [EFFECT_RAINBOW, EFFECT_BREATHING, EFFECT_CANDLE, *PALETTES]
+
+# Entries of the precomputed color tables, one table is shared by all strips
+STEPS = 256
+
+# Seconds per cycle at speed 1
+RAINBOW_PERIOD = 10.0
+BREATHING_PERIOD = 4.0
+PALETTE_PERIOD = 20.0
+# Seconds between candle flickers at speed 1
+FLICKER_INTERVAL = 0.15
+
+# Dimmest level of the breathing effect, the strip looks off below it
+BREATHING_MIN_LEVEL = 16
+CANDLE_COLOR: RgbColor = (255, 147, 41)
+# Level range and smoothing of the candle flicker
+CANDLE_LEVELS = (140, 255)
+CANDLE_SMOOTHING = 0.5
+
+# Levels of one breath, starting and ending dim
+_BREATH = tuple(
+    round(
+        BREATHING_MIN_LEVEL
+        + (STEPS - 1 - BREATHING_MIN_LEVEL)
+        * (1 - math.cos(2 * math.pi * step / STEPS))
+        / 2
+    )
+    for step in range(STEPS)
+)
+
+
+@cache
+def _rainbow() -> tuple[RgbColor, ...]:
+    """Fully saturated hues around the color wheel."""
+    return tuple(
+        (round(red * 255), round(green * 255), round(blue * 255))
+        for red, green, blue in (
+            colorsys.hsv_to_rgb(step / STEPS, 1, 1) for step in range(STEPS)
+        )
+    )
+
+
+@cache
+def _gradient(colors: tuple[RgbColor, ...]) -> tuple[RgbColor, ...]:
+    """Blend the colors of a palette into a cycle that wraps around."""
+    table: list[RgbColor] = []
+    for step in range(STEPS):
+        position = step * len(colors) / STEPS
+        index = int(position)
+        progress = position - index
+        start = colors[index]
+        end = colors[(index + 1) % len(colors)]
+        table.append(
+            (
+                round(start[0] + (end[0] - start[0]) * progress),
+                round(start[1] + (end[1] - start[1]) * progress),
+                round(start[2] + (end[2] - start[2]) * progress),
+            )
+        )
+    return tuple(table)
+
+
+@lru_cache(maxsize=32)
+def _levels(color: RgbColor) -> tuple[RgbColor, ...]:
+    """Scale a color from off to full."""
+    return tuple(
+        (
+            color[0] * level // (STEPS - 1),
+            color[1] * level // (STEPS - 1),
+            color[2] * level // (STEPS - 1),
+        )
+        for level in range(STEPS)
+    )
+
+
+@lru_cache(maxsize=32)
+def _breathing(color: RgbColor) -> tuple[RgbColor, ...]:
+    """Fade a color in and out once."""
+    levels = _levels(color)
+    return tuple(levels[level] for level in _BREATH)
+
+
+def cycle_frames(
+    table: tuple[RgbColor, ...], period: float, *, color_correction: bool = True
+) -> Frames:
+    """Loop through a color table once per period, forever."""
+    steps = len(table)
+    elapsed = 0.0
+    while True:
+        # Only the command is allocated per frame, the colors are shared
+        elapsed = yield DaybetterLedStripCommand(
+            color=table[int(elapsed / period * steps) % steps],
+            color_correction=color_correction,
+        )
+
+
+def candle_frames(interval: float, *, color_correction: bool = True) -> Frames:
+    """Flicker like a candle, with a new target level every interval."""
+    levels = _levels(CANDLE_COLOR)
+    level = target = float(CANDLE_LEVELS[1])
+    next_flicker = 0.0
+    elapsed = 0.0
+    while True:
+        if elapsed >= next_flicker:
+            target = random.randint(*CANDLE_LEVELS)  # noqa: S311 not security related
+            next_flicker = elapsed + interval
+        level += CANDLE_SMOOTHING * (target - level)
+        elapsed = yield DaybetterLedStripCommand(
+            color=levels[round(level)], color_correction=color_correction
+        )
+
+
+def host_effect_frames(
+    effect: str,
+    color: RgbColor,
+    speed: float,
+    *,
+    color_correction: bool = True,
+) -> Frames:
+    """Create the frames of a host effect, the color is used by breathing."""
+    if effect == EFFECT_CANDLE:
+        return candle_frames(
+            FLICKER_INTERVAL / speed, color_correction=color_correction
+        )
+    if effect == EFFECT_RAINBOW:
+        table, period = _rainbow(), RAINBOW_PERIOD
+    elif effect == EFFECT_BREATHING:
+        table, period = _breathing(tuple(color)), BREATHING_PERIOD
+    else:
+        table, period = _gradient(PALETTES[effect]), PALETTE_PERIOD
+    return cycle_frames(table, period / speed, color_correction=color_correction)
+
+
+def start_frames(command: DaybetterLedStripCommand, frames: Frames) -> Frames:
+    """Send a command, such as power and brightness, before streaming frames."""
+    yield command
+    yield from frames
@@ -12,9 +12,15 @@ from .coordinator import DaybetterLedStripCoordinator
 class DaybetterLedStripEntity(CoordinatorEntity[DaybetterLedStripCoordinator]):
     """Superclass for all entities with device info and coordinator prefilled."""
 
-    def __init__(self, coordinator: DaybetterLedStripCoordinator, key: str) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: DaybetterLedStripCoordinator,
+        key: str,
+        fields: frozenset[str],
+    ) -> None:
+        """Initialize with the state fields the entity depends on."""
+        # availability applies to every entity
+        super().__init__(coordinator, fields | {"available"})
         self._attr_device_info = DeviceInfo(
             identifiers={
                 (
@@ -28,3 +34,23 @@ class DaybetterLedStripEntity(CoordinatorEntity[DaybetterLedStripCoordinator]):
         self._attr_unique_id = (
             f"{self.coordinator.config_entry.runtime_data.device.address}_{key}"
         )
+
+    @property
+    def available(self) -> bool:
+        """Unavailable while the strip is out of range or its breaker is open."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.coordinator.data.available
+        )
+
+    def _available_changed(self) -> bool:
+        """Whether the coordinator update being handled changed availability."""
+        changed = self.coordinator.changed
+        return changed is None or "available" in changed
+
+    async def async_added_to_hass(self) -> None:
+        """Apply the current state, later updates only arrive when it changes."""
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update()
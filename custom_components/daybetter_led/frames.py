@@ -0,0 +1,179 @@
+"""Host-driven frame streaming for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from .commands import DaybetterLedStripCommand
+from .const import Priority
+from .profiler import async_get_profiler
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from daybetter_led_strip.util import RgbColor
+    from homeassistant.core import HomeAssistant
+
+    from .commands import DaybetterLedStripCommandQueue
+    from .models import DaybetterLedStripConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Generators receive the seconds elapsed since the start through send() and
+# yield the next frame. The first frame is requested with next().
+type Frames = Generator[DaybetterLedStripCommand, float]
+
+# Seconds, fastest frame rate regardless of how fast the link is
+MIN_FRAME_INTERVAL = 0.05
+# Weight of the newest sample in the write latency average
+LATENCY_SMOOTHING = 0.3
+
+
+class DaybetterLedStripFrameScheduler:
+    """
+    Stream frames to a strip as fast as the link sustains.
+
+    The frame interval follows the measured time it takes to write a frame.
+    Frames are generated for the current time when the previous write
+    finished, so frames are dropped instead of queued when the link falls
+    behind. Starting new frames or sending any other command cancels the
+    running stream. Frames are sent on the background lane, so any other
+    command to the strip goes first.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: DaybetterLedStripConfigEntry,
+        commands: DaybetterLedStripCommandQueue,
+    ) -> None:
+        """Initialize an idle scheduler."""
+        self._hass = hass
+        self._entry = entry
+        self._commands = commands
+        self._task: asyncio.Task[None] | None = None
+        # seconds, average time to write one frame
+        self.latency = MIN_FRAME_INTERVAL
+
+    @property
+    def running(self) -> bool:
+        """Whether frames are being streamed."""
+        return self._task is not None and not self._task.done()
+
+    def async_start(self, frames: Frames) -> asyncio.Task[None]:
+        """Replace the running stream with new frames."""
+        self.async_cancel()
+        self._task = self._entry.async_create_background_task(
+            self._hass,
+            self._async_run(frames),
+            f"{self._entry.title} frames",
+        )
+        async_get_profiler(self._hass).track_task("frames", self._task)
+        return self._task
+
+    def async_cancel(self) -> None:
+        """Stop the running stream."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self, frames: Frames) -> None:
+        """Write frames until the generator is exhausted."""
+        loop = self._hass.loop
+        start = loop.time()
+        try:
+            command = next(frames)
+            while True:
+                frame_start = loop.time()
+                await self._commands.async_send(command, Priority.BACKGROUND)
+                now = loop.time()
+                self.latency += LATENCY_SMOOTHING * (now - frame_start - self.latency)
+                # wait out the rest of the frame, if the write was fast enough
+                delay = max(MIN_FRAME_INTERVAL, self.latency) - (now - frame_start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                command = frames.send(loop.time() - start)
+        except StopIteration:
+            pass
+        finally:
+            frames.close()
+
+
+def _lerp(start: float, end: float, progress: float) -> int:
+    return round(start + (end - start) * progress)
+
+
+def transition_frames(  # noqa: PLR0913
+    start_brightness: int,
+    end_brightness: int,
+    start_color: RgbColor | None,
+    end_color: RgbColor | None,
+    duration: float,
+    *,
+    color_correction: bool = True,
+) -> Frames:
+    """Fade brightness (0-100) and color linearly over the duration."""
+    elapsed = 0.0
+    while elapsed < duration:
+        progress = elapsed / duration
+        command = DaybetterLedStripCommand(
+            brightness=_lerp(start_brightness, end_brightness, progress)
+        )
+        if start_color is not None and end_color is not None:
+            command.color = (
+                _lerp(start_color[0], end_color[0], progress),
+                _lerp(start_color[1], end_color[1], progress),
+                _lerp(start_color[2], end_color[2], progress),
+            )
+            command.color_correction = color_correction
+        elapsed = yield command
+
+    # always finish on the exact target
+    yield DaybetterLedStripCommand(
+        brightness=end_brightness,
+        color=end_color,
+        color_correction=color_correction,
+    )
+
+
+def turn_on_frames(  # noqa: PLR0913
+    *,
+    on: bool,
+    start_brightness: int,
+    end_brightness: int,
+    start_color: RgbColor | None,
+    end_color: RgbColor | None,
+    duration: float,
+    color_correction: bool = True,
+) -> Frames:
+    """Turn on at the start brightness if needed, then fade to the target."""
+    if on:
+        # the state may be cached, power is only written if the strip
+        # didn't confirm it
+        yield DaybetterLedStripCommand(power=True)
+    else:
+        yield DaybetterLedStripCommand(
+            power=True,
+            brightness=start_brightness,
+            color=end_color,
+            color_correction=color_correction,
+        )
+    yield from transition_frames(
+        start_brightness,
+        end_brightness,
+        start_color,
+        end_color,
+        duration,
+        color_correction=color_correction,
+    )
+
+
+def turn_off_frames(brightness: int, duration: float) -> Frames:
+    """Fade out from the brightness, turn off and restore the brightness."""
+    yield from transition_frames(brightness, 0, None, None, duration)
+    yield DaybetterLedStripCommand(power=False)
+    # The strip stays off, but whatever turns it on next, even after a
+    # restart, finds the brightness from before the fade
+    yield DaybetterLedStripCommand(brightness=brightness)
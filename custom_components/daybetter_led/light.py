@@ -4,31 +4,55 @@ from __future__ import annotations
 
 import logging
 import math
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Final
 
+import voluptuous as vol
 from daybetter_led_strip.const import Effect
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_EFFECT,
     ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
     EFFECT_OFF,
     LightEntity,
     LightEntityDescription,
 )
 from homeassistant.components.light.const import ColorMode, LightEntityFeature
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, HassJob, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.util.color import brightness_to_value, value_to_brightness
 
-from custom_components.daybetter_led.const import CONF_COLOR_CORRECTION
+from custom_components.daybetter_led.const import (
+    AMBIENT_REGIONS,
+    AMBIENT_SAMPLE_SIZE,
+    CONF_COLOR_CORRECTION,
+    CONF_OPTIMISTIC,
+    DEFAULT_OPTIMISTIC,
+    DOMAIN,
+)
 
+from .commands import DaybetterLedStripCommand, context_priority
+from .effects import HOST_EFFECTS, host_effect_frames, start_frames
 from .entity import DaybetterLedStripEntity
+from .frames import turn_off_frames, turn_on_frames
+from .streams import KIND_PIPE, source_kind
 
 if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Mapping
+    from types import ModuleType
+
+    from daybetter_led_strip.util import RgbColor
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import DaybetterLedStripCoordinator
-    from .models import DaybetterLedStripConfigEntry
+    from .frames import Frames
+    from .models import DaybetterLedStripConfigEntry, DaybetterLedStripState
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +68,64 @@ ENTITY_DESCRIPTIONS = (
 # Light is still on for brightness 0
 BRIGHTNESS_RANGE = (0, 100)
 
+# Seconds the strip has to confirm optimistic state before it is rolled back
+OPTIMISTIC_TIMEOUT = 5
+
+ATTR_SPEED: Final = "speed"
+ATTR_SOURCE: Final = "source"
+ATTR_SAMPLE_RATE: Final = "sample_rate"
+ATTR_CHANNELS: Final = "channels"
+ATTR_REGION: Final = "region"
+ATTR_WIDTH: Final = "width"
+ATTR_HEIGHT: Final = "height"
+ATTR_FPS: Final = "fps"
+ATTR_SMOOTHING: Final = "smoothing"
+
+SERVICE_START_EFFECT = "start_effect"
+SERVICE_START_EFFECT_SCHEMA: Final = {
+    vol.Required(ATTR_EFFECT): vol.In(HOST_EFFECTS),
+    vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0.1, max=10)
+    ),
+    vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional(ATTR_RGB_COLOR): vol.All(
+        vol.Coerce(tuple), vol.ExactSequence((cv.byte, cv.byte, cv.byte))
+    ),
+}
+
+SERVICE_START_AUDIO = "start_audio"
+SERVICE_START_AUDIO_SCHEMA: Final = {
+    # raw signed 16-bit little endian PCM, from a file or a named pipe
+    vol.Required(ATTR_SOURCE): cv.string,
+    vol.Optional(ATTR_SAMPLE_RATE, default=44100): vol.All(
+        vol.Coerce(int), vol.Range(min=8000, max=192000)
+    ),
+    vol.Optional(ATTR_CHANNELS, default=1): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=8)
+    ),
+}
+
+SERVICE_START_AMBIENT = "start_ambient"
+SERVICE_START_AMBIENT_SCHEMA: Final = {
+    # an image, a directory of images or a named pipe of raw RGB24 frames
+    vol.Required(ATTR_SOURCE): cv.string,
+    vol.Optional(ATTR_REGION, default="full"): vol.In(list(AMBIENT_REGIONS)),
+    # frame size of a pipe, at least the size frames are sampled down to
+    vol.Inclusive(ATTR_WIDTH, "size"): vol.All(
+        vol.Coerce(int), vol.Range(min=AMBIENT_SAMPLE_SIZE[0], max=7680)
+    ),
+    vol.Inclusive(ATTR_HEIGHT, "size"): vol.All(
+        vol.Coerce(int), vol.Range(min=AMBIENT_SAMPLE_SIZE[1], max=4320)
+    ),
+    # how often images are checked for changes
+    vol.Optional(ATTR_FPS, default=15): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=30)
+    ),
+    vol.Optional(ATTR_SMOOTHING, default=0.5): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=0.95)
+    ),
+}
+
 SUPPORTED_EFFECTS = [
     EFFECT_OFF,
     "switch_rgb",
@@ -73,25 +155,52 @@ SUPPORTED_EFFECTS = [
 ]
 
 
+# we ignore effects up to SWITCH_RGB, +1 for EFFECT_OFF
+EFFECTS_BY_STR: dict[str, Effect] = {
+    effect_str: Effect(index + Effect.SWITCH_RGB - 1)
+    for index, effect_str in enumerate(SUPPORTED_EFFECTS)
+    if index > 0
+}
+EFFECT_STRS_BY_EFFECT: dict[int, str] = {
+    effect: effect_str for effect_str, effect in EFFECTS_BY_STR.items()
+}
+
+
 def effect_to_effect_str(effect: Effect | None) -> str:
     """Convert Effect enum value to effect string."""
-    # we ignore effects up to SWITCH_RGB, +1 for EFFECT_OFF
-    if effect is None:
-        return EFFECT_OFF
-    val = effect - Effect.SWITCH_RGB + 1
-    if val <= 0 or val >= len(SUPPORTED_EFFECTS):
-        return EFFECT_OFF
-    return SUPPORTED_EFFECTS[val]
+    return EFFECT_STRS_BY_EFFECT.get(effect, EFFECT_OFF)
 
 
 def effect_str_to_effect(effect_str: str) -> Effect | None:
     """Convert effect string to Effect enum value,, or None if unsupported/off."""
-    if effect_str not in SUPPORTED_EFFECTS:
-        return None
-    val = SUPPORTED_EFFECTS.index(effect_str)
-    if val <= 0:
-        return None
-    return Effect(val + Effect.SWITCH_RGB - 1)
+    return EFFECTS_BY_STR.get(effect_str)
+
+
+def build_turn_on_command(
+    entry: DaybetterLedStripConfigEntry, kwargs: Mapping[str, Any]
+) -> DaybetterLedStripCommand:
+    """Convert light turn on arguments into a command for the strip."""
+    command = DaybetterLedStripCommand(power=True)
+
+    if ATTR_BRIGHTNESS in kwargs:
+        command.brightness = math.floor(
+            brightness_to_value(BRIGHTNESS_RANGE, kwargs[ATTR_BRIGHTNESS])
+        )
+
+    if ATTR_RGB_COLOR in kwargs:
+        command.color = tuple(kwargs[ATTR_RGB_COLOR])
+        # default to True
+        command.color_correction = entry.options.get(CONF_COLOR_CORRECTION, True)
+
+    if ATTR_EFFECT in kwargs:
+        effect = effect_str_to_effect(kwargs[ATTR_EFFECT])
+        if effect is not None:
+            command.merge(DaybetterLedStripCommand(effect=effect))
+        elif kwargs[ATTR_EFFECT] not in HOST_EFFECTS:
+            # default to white - no color saved
+            command.merge(DaybetterLedStripCommand(color=(255, 255, 255)))
+
+    return command
 
 
 async def async_setup_entry(
@@ -100,6 +209,15 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the light platform."""
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_START_EFFECT, SERVICE_START_EFFECT_SCHEMA, "async_start_effect"
+    )
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_START_AUDIO, SERVICE_START_AUDIO_SCHEMA, "async_start_audio"
+    )
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_START_AMBIENT, SERVICE_START_AMBIENT_SCHEMA, "async_start_ambient"
+    )
     async_add_entities(
         DaybetterLedStripLight(
             coordinator=entry.runtime_data.coordinator,
@@ -109,13 +227,54 @@ async def async_setup_entry(
     )
 
 
+def state_to_attrs(state: DaybetterLedStripState) -> dict[str, Any]:
+    """Convert a confirmed strip state to light entity attributes."""
+    return {
+        # scale brightness
+        "brightness": value_to_brightness(BRIGHTNESS_RANGE, state.brightness)
+        if state.brightness is not None
+        else None,
+        "rgb_color": state.color,
+        "is_on": state.on,
+        "effect": effect_to_effect_str(state.effect),
+    }
+
+
+def command_to_attrs(command: DaybetterLedStripCommand) -> dict[str, Any]:
+    """Get the light entity attributes a command will result in."""
+    if command.power is False:
+        return {"is_on": False}
+
+    attrs: dict[str, Any] = {}
+    if command.power:
+        attrs["is_on"] = True
+    if command.brightness is not None:
+        attrs["brightness"] = value_to_brightness(BRIGHTNESS_RANGE, command.brightness)
+    # color and effect clear each other
+    if command.color is not None:
+        attrs["rgb_color"] = command.color
+        attrs["effect"] = EFFECT_OFF
+    elif command.effect is not None:
+        attrs["rgb_color"] = None
+        attrs["effect"] = effect_to_effect_str(command.effect)
+    return attrs
+
+
 class DaybetterLedStripLight(DaybetterLedStripEntity, LightEntity):
-    """RGB Light class."""
+    """
+    RGB Light class.
+
+    In optimistic mode requested attributes are shown right away and rolled
+    back to the confirmed state if the write fails or the strip does not
+    confirm them in time. The state from before a restart comes from the
+    state cache through the coordinator, since the strip is not contacted
+    until it is used.
+    """
 
     _attr_supported_color_modes = {ColorMode.RGB}  # noqa: RUF012
     _attr_color_mode = ColorMode.RGB
-    _attr_supported_features = LightEntityFeature.EFFECT
-    _attr_effect_list = SUPPORTED_EFFECTS
+    _attr_supported_features = LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
+    _attr_effect_list = [*SUPPORTED_EFFECTS, *HOST_EFFECTS]  # noqa: RUF012
 
     def __init__(
         self,
@@ -123,56 +282,281 @@ class DaybetterLedStripLight(DaybetterLedStripEntity, LightEntity):
         entity_description: LightEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator, entity_description.key)
+        super().__init__(
+            coordinator,
+            entity_description.key,
+            frozenset({"on", "color", "brightness", "effect"}),
+        )
         self.entity_description = entity_description
+        self._optimistic_mode = coordinator.config_entry.options.get(
+            CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC
+        )
+        # attributes shown before the strip confirmed them
+        self._optimistic: dict[str, Any] = {}
+        self._cancel_rollback: CALLBACK_TYPE | None = None
+        # brightness before a fade out, for a turn on that cuts it short
+        self._faded_brightness: int | None = None
+        # host effect streamed to the strip, and the task streaming it
+        self._host_effect: str | None = None
+        self._effect_task: asyncio.Task[None] | None = None
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        self._attr_available = self.coordinator.data["connected"]
-        if self.coordinator.data["brightness"] is not None:
-            # scale brightness
-            self._attr_brightness = value_to_brightness(
-                BRIGHTNESS_RANGE, self.coordinator.data["brightness"]
-            )
-        else:
-            self._attr_brightness = None
-        self._attr_rgb_color = self.coordinator.data["color"]
-        self._attr_is_on = self.coordinator.data["on"]
-        self._attr_effect = effect_to_effect_str(self.coordinator.data["effect"])
+        state = self.coordinator.data
+        confirmed = state_to_attrs(state)
+        if self._optimistic:
+            # forget the optimistic attributes the strip has confirmed
+            self._optimistic = {
+                key: value
+                for key, value in self._optimistic.items()
+                if confirmed[key] != value
+            }
+            if not self._optimistic:
+                self._async_cancel_rollback()
+        attrs = confirmed | self._optimistic
+        if self._host_effect is not None:
+            # the frames change the color faster than it's worth showing
+            attrs["effect"] = self._host_effect
+            attrs.pop("rgb_color", None)
+        for key, value in attrs.items():
+            setattr(self, f"_attr_{key}", value)
         self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending rollback and running transition."""
+        self.coordinator.config_entry.runtime_data.frames.async_cancel()
+        self._async_cancel_rollback()
+        await super().async_will_remove_from_hass()
+
     async def async_turn_on(self, **kwargs) -> None:  # noqa: ANN003
         """Turn the light on with the given color configuration."""
-        device = self.coordinator.config_entry.runtime_data.device
+        command = build_turn_on_command(self.coordinator.config_entry, kwargs)
+        if command.brightness is None and self._faded_brightness is not None:
+            command.brightness = self._faded_brightness
+        self._faded_brightness = None
+        if (effect := kwargs.get(ATTR_EFFECT)) in HOST_EFFECTS:
+            await self._async_start_effect(effect, command, 1.0)
+            return
+        frames = None
+        # firmware effects can't be faded
+        if (transition := kwargs.get(ATTR_TRANSITION)) and command.effect is None:
+            state = self.coordinator.data
+            on = bool(state.on)
+            end_brightness = command.brightness
+            if end_brightness is None:
+                end_brightness = (
+                    state.brightness
+                    if state.brightness is not None
+                    else BRIGHTNESS_RANGE[1]
+                )
+            frames = turn_on_frames(
+                on=on,
+                start_brightness=(
+                    state.brightness
+                    if on and state.brightness is not None
+                    else BRIGHTNESS_RANGE[0]
+                ),
+                end_brightness=end_brightness,
+                start_color=state.color if on else command.color,
+                end_color=command.color,
+                duration=transition,
+                color_correction=command.color_correction,
+            )
+        await self._async_send(command, frames)
 
-        if not self.is_on:
-            await device.set_power(True)
+    async def async_turn_off(self, **kwargs) -> None:  # noqa: ANN003
+        """Turn the light off."""
+        frames = None
+        state = self.coordinator.data
+        if (
+            (transition := kwargs.get(ATTR_TRANSITION))
+            and state.on
+            and state.brightness
+        ):
+            frames = turn_off_frames(state.brightness, transition)
+            self._faded_brightness = state.brightness
+        return await self._async_send(DaybetterLedStripCommand(power=False), frames)
 
-        if ATTR_BRIGHTNESS in kwargs:
-            await device.set_brightness(
-                math.floor(
-                    brightness_to_value(BRIGHTNESS_RANGE, kwargs[ATTR_BRIGHTNESS])
-                )
+    async def async_start_effect(self, effect: str, speed: float, **kwargs) -> None:  # noqa: ANN003
+        """Turn the light on and stream a host effect at the given speed."""
+        command = build_turn_on_command(self.coordinator.config_entry, kwargs)
+        await self._async_start_effect(effect, command, speed)
+
+    async def _async_start_effect(
+        self, effect: str, command: DaybetterLedStripCommand, speed: float
+    ) -> None:
+        """Apply power and brightness of a command, then stream the effect."""
+        color: RgbColor = (
+            command.color or self.coordinator.data.color or (255, 255, 255)
+        )
+        # the effect sets the color
+        command.color = None
+        frames = host_effect_frames(
+            effect,
+            color,
+            speed,
+            color_correction=self.coordinator.config_entry.options.get(
+                CONF_COLOR_CORRECTION, True
+            ),
+        )
+        await self._async_send(command, start_frames(command, frames), effect)
+
+    async def async_start_audio(
+        self, source: str, sample_rate: int, channels: int
+    ) -> None:
+        """Turn the light on and follow the levels of an audio source."""
+        await self._async_check_source(source)
+        audio = await self._async_import("audio")
+        command = DaybetterLedStripCommand(power=True)
+        frames = audio.audio_frames(
+            audio.async_get_audio_source(self.hass, source, sample_rate, channels),
+            color_correction=self.coordinator.config_entry.options.get(
+                CONF_COLOR_CORRECTION, True
+            ),
+        )
+        await self._async_send(
+            command, start_frames(command, frames), audio.EFFECT_AUDIO
+        )
+
+    async def async_start_ambient(  # noqa: PLR0913
+        self,
+        source: str,
+        region: str,
+        fps: float,
+        smoothing: float,
+        width: int | None = None,
+        height: int | None = None,
+    ) -> None:
+        """Turn the light on and follow the colors of a region of a frame source."""
+        kind = await self._async_check_source(source)
+        size = (width, height) if width is not None and height is not None else None
+        if kind == KIND_PIPE and size is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="frame_size_required",
+                translation_placeholders={"path": source},
             )
+        ambient = await self._async_import("ambient")
+        command = DaybetterLedStripCommand(power=True)
+        frames = ambient.ambient_frames(
+            ambient.async_get_ambient_source(
+                self.hass,
+                source,
+                kind,
+                size if kind == KIND_PIPE else None,
+                fps,
+                smoothing,
+            ),
+            region,
+            color_correction=self.coordinator.config_entry.options.get(
+                CONF_COLOR_CORRECTION, True
+            ),
+        )
+        await self._async_send(
+            command, start_frames(command, frames), ambient.EFFECT_AMBIENT
+        )
 
-        if ATTR_RGB_COLOR in kwargs:
-            await device.set_color(
-                kwargs[ATTR_RGB_COLOR],
-                # default to True
-                color_correction=self.coordinator.config_entry.options.get(
-                    CONF_COLOR_CORRECTION,
-                    True,
-                ),
+    async def _async_import(self, name: str) -> ModuleType:
+        """Import the module of a source, numpy is only loaded once one is used."""
+        return await async_import_module(self.hass, f"{__package__}.{name}")
+
+    async def _async_check_source(self, path: str) -> str:
+        """Check a file source may be read, returning what kind of file it is."""
+        if not self.hass.config.is_allowed_path(path):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="path_not_allowed",
+                translation_placeholders={"path": path},
+            )
+        if (kind := await self.hass.async_add_executor_job(source_kind, path)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="path_not_found",
+                translation_placeholders={"path": path},
             )
+        return kind
+
+    async def _async_send(
+        self,
+        command: DaybetterLedStripCommand,
+        frames: Frames | None = None,
+        effect: str | None = None,
+    ) -> None:
+        """
+        Send a command, or stream frames that start or end in it.
 
-        if ATTR_EFFECT in kwargs:
-            effect = effect_str_to_effect(kwargs[ATTR_EFFECT])
+        Shows the result optimistically if enabled. Frames are streamed in the
+        background so the service call returns right away. The effect names
+        the host effect the frames belong to.
+        """
+        runtime_data = self.coordinator.config_entry.runtime_data
+        # a new command supersedes a running transition or effect
+        runtime_data.frames.async_cancel()
+        self._effect_task = None
+        if effect != self._host_effect:
+            self._host_effect = effect
+            if not self._optimistic_mode:
+                self._handle_coordinator_update()
+
+        if self._optimistic_mode:
+            self._optimistic |= command_to_attrs(command)
+            self._async_cancel_rollback()
+            self._handle_coordinator_update()
+
+        if frames is not None:
+            task = runtime_data.frames.async_start(frames)
+            task.add_done_callback(self._async_frames_done)
             if effect is not None:
-                await device.set_effect(effect)
-            else:
-                # default to white - no color saved
-                await device.set_color((255, 255, 255))
+                self._effect_task = task
+            return
 
-    async def async_turn_off(self) -> None:
-        """Turn the light off."""
-        return await self.coordinator.config_entry.runtime_data.device.set_power(False)
+        try:
+            await runtime_data.commands.async_send(
+                command, context_priority(self._context)
+            )
+        except Exception:
+            self._async_rollback()
+            raise
+        self._async_schedule_rollback()
+
+    @callback
+    def _async_frames_done(self, task: asyncio.Task[None]) -> None:
+        """Confirm or roll back the optimistic state once a stream ends."""
+        if task is self._effect_task:
+            # the effect was stopped by something other than this light
+            self._effect_task = None
+            self._host_effect = None
+            self._handle_coordinator_update()
+        # cancelled by a newer command, which handles the state
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self._async_rollback()
+        else:
+            self._async_schedule_rollback()
+
+    @callback
+    def _async_schedule_rollback(self) -> None:
+        """Roll back the optimistic state unless the strip confirms it in time."""
+        # the ack from the strip normally confirms the state before this fires
+        if self._optimistic and self._cancel_rollback is None:
+            self._cancel_rollback = async_call_later(
+                self.hass,
+                OPTIMISTIC_TIMEOUT,
+                HassJob(self._async_rollback, cancel_on_shutdown=True),
+            )
+
+    @callback
+    def _async_rollback(self, _now: object = None) -> None:
+        """Drop the unconfirmed attributes and show the confirmed state."""
+        self._cancel_rollback = None
+        if self._optimistic:
+            _LOGGER.debug("%s: rolling back unconfirmed state", self.entity_id)
+            self._optimistic = {}
+            self._handle_coordinator_update()
+
+    @callback
+    def _async_cancel_rollback(self) -> None:
+        if self._cancel_rollback is not None:
+            self._cancel_rollback()
+            self._cancel_rollback = None
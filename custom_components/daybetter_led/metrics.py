@@ -0,0 +1,100 @@
+"""Per-strip performance metrics for daybetter_led_strip."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last
+# bucket counts everything slower
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed bucket latency histogram that never grows."""
+
+    __slots__ = ("count", "counts", "last", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        # milliseconds
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        milliseconds = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+        self.last = milliseconds
+
+    @property
+    def mean(self) -> float | None:
+        """Average latency in milliseconds."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the histogram for diagnostics."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS]
+        labels.append(f">{LATENCY_BUCKETS[-1]}ms")
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 1) if self.mean is not None else None,
+            "max": round(self.max, 1),
+            "last": round(self.last, 1) if self.last is not None else None,
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class DaybetterLedStripMetrics:
+    """Counters and latencies of one strip since the entry was set up."""
+
+    connects: int = 0
+    connect_failures: int = 0
+    # waiting for a free connection slot on the adapter
+    slot_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    connect_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # from submitting a command until it was written
+    command_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # a single GATT write
+    write_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    write_failures: int = 0
+    # attempts repeated after a failed connection or write
+    retries: int = 0
+    # commands that ran out of time
+    timeouts: int = 0
+    # commands failed right away while the circuit breaker was open
+    rejected_commands: int = 0
+    breaker_trips: int = 0
+    # writes dropped because the strip was already in the requested state
+    skipped_writes: int = 0
+    # pending frames dropped for a command on a faster lane
+    dropped_frames: int = 0
+    # commands waiting to be written
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    advertisements_received: int = 0
+    advertisements_processed: int = 0
+    last_seen: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the metrics for diagnostics."""
+        result: dict[str, Any] = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            result[name] = (
+                value.as_dict() if isinstance(value, LatencyHistogram) else value
+            )
+        if self.last_seen is not None:
+            result["last_seen"] = self.last_seen.isoformat()
+        return result
@@ -10,9 +10,14 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
+    from .breaker import DaybetterLedStripCircuitBreaker
+    from .color import DaybetterLedStripColorPipeline
+    from .commands import DaybetterLedStripCommandQueue
     from .coordinator import (
         DaybetterLedStripCoordinator,
     )
+    from .frames import DaybetterLedStripFrameScheduler
+    from .metrics import DaybetterLedStripMetrics
 
 type DaybetterLedStripConfigEntry = ConfigEntry[DaybetterLedStripData]
 
@@ -24,15 +29,31 @@ class DaybetterLedStripData:
     device: DaybetterLedStrip
     coordinator: DaybetterLedStripCoordinator
     integration: Integration
+    colors: DaybetterLedStripColorPipeline
+    commands: DaybetterLedStripCommandQueue
+    frames: DaybetterLedStripFrameScheduler
+    metrics: DaybetterLedStripMetrics
+    breaker: DaybetterLedStripCircuitBreaker
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DaybetterLedStripState:
     """State for the Daybetter LED Strip integration."""
 
     connected: bool | None
+    available: bool
     on: bool | None
     color: tuple[int, int, int] | None
     brightness: int | None
     rssi: int | None
     effect: int | None
+
+    def changed_fields(self, other: DaybetterLedStripState | None) -> frozenset[str]:
+        """Get the names of the fields that differ from another state."""
+        if other is None:
+            return frozenset(self.__slots__)
+        return frozenset(
+            name
+            for name in self.__slots__
+            if getattr(self, name) != getattr(other, name)
+        )
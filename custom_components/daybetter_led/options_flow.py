@@ -4,14 +4,94 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigFlowResult, OptionsFlowWithReload
+from homeassistant.helpers import selector
 
-from custom_components.daybetter_led.const import CONF_COLOR_CORRECTION
+from custom_components.daybetter_led.color import DEFAULT_WHITE_BALANCE
+from custom_components.daybetter_led.const import (
+    CONF_COLOR_CORRECTION,
+    CONF_COMMAND_TIMEOUT,
+    CONF_DEBOUNCE,
+    CONF_GAMMA,
+    CONF_IDLE_TIMEOUT,
+    CONF_OPTIMISTIC,
+    CONF_PREWARM_DURATION,
+    CONF_PREWARM_ENTITIES,
+    CONF_RSSI_HYSTERESIS,
+    CONF_RSSI_INTERVAL,
+    CONF_RSSI_SMOOTHING,
+    CONF_WHITE_BALANCE_BLUE,
+    CONF_WHITE_BALANCE_GREEN,
+    CONF_WHITE_BALANCE_RED,
+    CONF_WRITE_BURST,
+    CONF_WRITE_RATE,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_GAMMA,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PREWARM_DURATION,
+    DEFAULT_RSSI_HYSTERESIS,
+    DEFAULT_RSSI_INTERVAL,
+    DEFAULT_RSSI_SMOOTHING,
+    DEFAULT_WRITE_BURST,
+    DEFAULT_WRITE_RATE,
+)
 
-OPTIONS_SCHEMA = vol.Schema({vol.Optional(CONF_COLOR_CORRECTION, default=True): bool})
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_COLOR_CORRECTION, default=True): bool,
+        vol.Optional(CONF_GAMMA, default=DEFAULT_GAMMA): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=5)
+        ),
+        vol.Optional(CONF_WHITE_BALANCE_RED, default=DEFAULT_WHITE_BALANCE[0]): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=255)
+        ),
+        vol.Optional(
+            CONF_WHITE_BALANCE_GREEN, default=DEFAULT_WHITE_BALANCE[1]
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(
+            CONF_WHITE_BALANCE_BLUE, default=DEFAULT_WHITE_BALANCE[2]
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): bool,
+        vol.Optional(CONF_WRITE_RATE, default=DEFAULT_WRITE_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(CONF_WRITE_BURST, default=DEFAULT_WRITE_BURST): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+        vol.Optional(CONF_DEBOUNCE, default=DEFAULT_DEBOUNCE): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=5000)
+        ),
+        vol.Optional(CONF_COMMAND_TIMEOUT, default=DEFAULT_COMMAND_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=60)
+        ),
+        vol.Optional(CONF_IDLE_TIMEOUT, default=DEFAULT_IDLE_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=86400)
+        ),
+        vol.Optional(CONF_PREWARM_ENTITIES, default=[]): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain=["binary_sensor", "input_boolean", "person", "device_tracker"],
+                multiple=True,
+            )
+        ),
+        vol.Optional(CONF_PREWARM_DURATION, default=DEFAULT_PREWARM_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=86400)
+        ),
+        vol.Optional(CONF_RSSI_INTERVAL, default=DEFAULT_RSSI_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=3600)
+        ),
+        vol.Optional(CONF_RSSI_HYSTERESIS, default=DEFAULT_RSSI_HYSTERESIS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=50)
+        ),
+        vol.Optional(CONF_RSSI_SMOOTHING, default=DEFAULT_RSSI_SMOOTHING): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
 
 
 class DaybetterLedStripOptionsFlow(OptionsFlowWithReload):
-    """Runtime configuration flow for color correction."""
+    """Runtime configuration flow for color correction, writes and connections."""
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -0,0 +1,72 @@
+"""Connection pre-warming for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_HOME, STATE_ON
+from homeassistant.core import Event, EventStateChangedData, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .connection import async_get_connection_manager
+from .const import (
+    CONF_PREWARM_DURATION,
+    CONF_PREWARM_ENTITIES,
+    DEFAULT_PREWARM_DURATION,
+)
+from .profiler import async_get_profiler
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .models import DaybetterLedStripConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# States of the trigger entities that announce the strip will be used soon
+PREWARM_STATES = frozenset({STATE_ON, STATE_HOME})
+
+
+async def async_prewarm(
+    hass: HomeAssistant, entry: DaybetterLedStripConfigEntry, duration: float
+) -> bool:
+    """Connect the strip of an entry ahead of its next command."""
+    device = entry.runtime_data.device
+    # the breaker probes unreachable strips on its own schedule
+    if not entry.runtime_data.breaker.closed:
+        return False
+    connected = await async_get_connection_manager(hass).async_prewarm(device, duration)
+    _LOGGER.debug("%s: pre-warmed, connected: %s", device.address, connected)
+    return connected
+
+
+@callback
+def async_setup_prewarm(
+    hass: HomeAssistant, entry: DaybetterLedStripConfigEntry
+) -> None:
+    """Pre-warm the connection whenever a trigger entity turns on or home."""
+    if not (entities := entry.options.get(CONF_PREWARM_ENTITIES)):
+        return
+    duration = entry.options.get(CONF_PREWARM_DURATION, DEFAULT_PREWARM_DURATION)
+
+    @callback
+    def _async_state_changed(event: Event[EventStateChangedData]) -> None:
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if (
+            new_state is None
+            or new_state.state not in PREWARM_STATES
+            or (old_state is not None and old_state.state in PREWARM_STATES)
+        ):
+            return
+        task = entry.async_create_background_task(
+            hass,
+            async_prewarm(hass, entry, duration),
+            f"{entry.title} pre-warm",
+        )
+        async_get_profiler(hass).track_task("prewarm", task)
+
+    entry.async_on_unload(
+        async_track_state_change_event(hass, entities, _async_state_changed)
+    )
@@ -0,0 +1,236 @@
+"""Event loop profiling for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    import asyncio
+    from contextlib import AbstractContextManager
+    from types import TracebackType
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILER: HassKey[DaybetterLedStripProfiler] = HassKey(f"{DOMAIN}_profiler")
+
+# Milliseconds a callback may block the event loop before it is flagged
+DEFAULT_SLOW_THRESHOLD = 5.0
+# Slow calls kept in the report
+SLOW_CALLS = 20
+# Strips listed in the report, the most expensive first
+TOP_STRIPS = 10
+
+_DISABLED = nullcontext()
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant) -> DaybetterLedStripProfiler:
+    """Get the integration-wide profiler, creating it if needed."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is None:
+        profiler = hass.data[DATA_PROFILER] = DaybetterLedStripProfiler()
+    return profiler
+
+
+class CallStats:
+    """Wall time of the calls of one callback for one strip."""
+
+    __slots__ = ("calls", "max", "slow", "total")
+
+    def __init__(self) -> None:
+        """Initialize without calls."""
+        self.calls = 0
+        self.slow = 0
+        # seconds
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, other: CallStats) -> None:
+        """Fold the calls of another strip into these."""
+        self.calls += other.calls
+        self.slow += other.slow
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def as_dict(self, window: float) -> dict[str, Any]:
+        """Summarize the calls, with their share of the profiled wall time."""
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total * 1000 / self.calls, 3) if self.calls else None,
+            "max_ms": round(self.max * 1000, 2),
+            "slow": self.slow,
+            "loop_share": f"{self.total / window:.2%}" if window else None,
+        }
+
+
+class _Measurement:
+    """Time one call while the profiler runs."""
+
+    __slots__ = ("_key", "_profiler", "_start")
+
+    def __init__(
+        self, profiler: DaybetterLedStripProfiler, key: tuple[str, str]
+    ) -> None:
+        self._profiler = profiler
+        self._key = key
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(
+        self,
+        _exc_type: type[BaseException] | None,
+        _exc: BaseException | None,
+        _traceback: TracebackType | None,
+    ) -> None:
+        self._profiler.record(*self._key, perf_counter() - self._start)
+
+
+class DaybetterLedStripProfiler:
+    """
+    Wall time and call counts of the integration's event loop callbacks.
+
+    Disabled by default, measuring then costs one attribute check per call.
+    While a profiling window runs, callbacks measured with measure and tasks
+    passed to track_task are recorded per strip, and calls above the slow
+    threshold are flagged. Times include nested calls, so the state change
+    callback includes the refresh and entity updates it triggers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a profiler that isn't running."""
+        self.enabled = False
+        # tasks of an earlier window aren't counted in the current one
+        self._window = 0
+        self._threshold = DEFAULT_SLOW_THRESHOLD / 1000
+        self._started = 0.0
+        self._stopped = 0.0
+        self._started_at: str | None = None
+        self._calls: dict[tuple[str, str], CallStats] = {}
+        self._tasks: dict[str, LatencyHistogram] = {}
+        self._running_tasks: dict[str, int] = {}
+        self._slow_calls: deque[dict[str, Any]] = deque(maxlen=SLOW_CALLS)
+
+    @callback
+    def async_start(self, slow_threshold: float = DEFAULT_SLOW_THRESHOLD) -> None:
+        """Start a profiling window, dropping the previous results."""
+        self._threshold = slow_threshold / 1000
+        self._calls.clear()
+        self._tasks.clear()
+        self._running_tasks.clear()
+        self._slow_calls.clear()
+        self._started = self._stopped = perf_counter()
+        self._started_at = dt_util.utcnow().isoformat()
+        self._window += 1
+        self.enabled = True
+
+    @callback
+    def async_stop(self) -> None:
+        """End the profiling window, keeping the results for the report."""
+        self.enabled = False
+        self._stopped = perf_counter()
+
+    def measure(self, name: str, strip: str) -> AbstractContextManager[None]:
+        """Time the calls of a callback for a strip while profiling."""
+        if not self.enabled:
+            return _DISABLED
+        return _Measurement(self, (name, strip))
+
+    def record(self, name: str, strip: str, seconds: float) -> None:
+        """Add a call."""
+        if (stats := self._calls.get((name, strip))) is None:
+            stats = self._calls[name, strip] = CallStats()
+        stats.calls += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        if seconds >= self._threshold:
+            stats.slow += 1
+            self._slow_calls.append(
+                {
+                    "callback": name,
+                    "strip": strip,
+                    "ms": round(seconds * 1000, 2),
+                    "at": dt_util.utcnow().isoformat(),
+                }
+            )
+            _LOGGER.debug(
+                "%s: %s blocked the event loop for %.1f ms",
+                strip,
+                name,
+                seconds * 1000,
+            )
+
+    def track_task(self, name: str, task: asyncio.Task[Any]) -> None:
+        """Record how long a spawned task runs while profiling."""
+        if not self.enabled:
+            return
+        start = perf_counter()
+        window = self._window
+        self._running_tasks[name] = self._running_tasks.get(name, 0) + 1
+
+        def _done(_task: asyncio.Task[Any]) -> None:
+            if window != self._window:
+                return
+            self._running_tasks[name] -= 1
+            if not self.enabled:
+                return
+            if (lifetimes := self._tasks.get(name)) is None:
+                lifetimes = self._tasks[name] = LatencyHistogram()
+            lifetimes.record(perf_counter() - start)
+
+        task.add_done_callback(_done)
+
+    def as_dict(self, strip: str | None = None) -> dict[str, Any]:
+        """Summarize the profiling window, for all strips or only one."""
+        window = (perf_counter() if self.enabled else self._stopped) - self._started
+        callbacks: dict[str, CallStats] = {}
+        strips: dict[str, CallStats] = {}
+        for (name, strip_name), stats in self._calls.items():
+            if strip is not None and strip_name != strip:
+                continue
+            callbacks.setdefault(name, CallStats()).add(stats)
+            strips.setdefault(strip_name, CallStats()).add(stats)
+
+        def _by_total(item: tuple[str, CallStats]) -> float:
+            return -item[1].total
+
+        result: dict[str, Any] = {
+            "running": self.enabled,
+            "started": self._started_at,
+            "window_s": round(window, 1),
+            "slow_threshold_ms": self._threshold * 1000,
+            "callbacks": {
+                name: stats.as_dict(window)
+                for name, stats in sorted(callbacks.items(), key=_by_total)
+            },
+            "slow_calls": [
+                call
+                for call in self._slow_calls
+                if strip is None or call["strip"] == strip
+            ],
+        }
+        if strip is None:
+            result["strips"] = {
+                name: stats.as_dict(window)
+                for name, stats in sorted(strips.items(), key=_by_total)[:TOP_STRIPS]
+            }
+            result["tasks"] = {
+                name: lifetimes.as_dict()
+                | {"running": self._running_tasks.get(name, 0)}
+                for name, lifetimes in self._tasks.items()
+            }
+        return result
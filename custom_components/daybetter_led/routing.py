@@ -0,0 +1,102 @@
+"""Adapter and proxy selection for daybetter_led_strip."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from statistics import fmean
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bleak.backends.device import BLEDevice
+
+# Number of RSSI samples and connect attempts remembered per path
+RSSI_SAMPLES = 10
+CONNECT_SAMPLES = 10
+# dB a path must beat the current one by before the strip is moved to it
+ROUTE_HYSTERESIS = 6
+# dB subtracted from a path that failed every recent connect attempt
+FAILURE_PENALTY = 30
+# Seconds after which a path that stopped seeing the strip is not used
+STALE_AFTER = 60
+
+
+@dataclass(slots=True)
+class _Path:
+    """History of one adapter or proxy seeing a strip."""
+
+    device: BLEDevice
+    last_seen: float
+    rssi: deque[int] = field(default_factory=lambda: deque(maxlen=RSSI_SAMPLES))
+    # True for successful connect attempts
+    connects: deque[bool] = field(default_factory=lambda: deque(maxlen=CONNECT_SAMPLES))
+
+    @property
+    def score(self) -> float:
+        """Average RSSI, lowered by the recent connect failure rate."""
+        failure_rate = (
+            self.connects.count(False) / len(self.connects) if self.connects else 0
+        )
+        return fmean(self.rssi) - FAILURE_PENALTY * failure_rate
+
+
+class DaybetterLedStripRouter:
+    """
+    Pick the adapter or proxy a strip is connected through.
+
+    Every path that sees the strip keeps a rolling RSSI and connect history.
+    The current path is kept until another one scores better by at least the
+    hysteresis or stops seeing the strip, so the route doesn't flap between
+    adapters with similar signal.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a router without paths."""
+        self._paths: dict[str, _Path] = {}
+        self.source: str | None = None
+
+    def update(self, source: str, device: BLEDevice, rssi: int, now: float) -> None:
+        """Record that an adapter or proxy saw the strip."""
+        if (path := self._paths.get(source)) is None:
+            path = self._paths[source] = _Path(device=device, last_seen=now)
+        path.device = device
+        path.last_seen = now
+        path.rssi.append(rssi)
+
+    def record_connect(self, source: str | None, *, success: bool) -> None:
+        """Record the outcome of a connect attempt through a path."""
+        if source is not None and (path := self._paths.get(source)) is not None:
+            path.connects.append(success)
+
+    def select(self, now: float) -> BLEDevice | None:
+        """Choose the path for the next connection and return its device."""
+        paths = {
+            source: path
+            for source, path in self._paths.items()
+            if now - path.last_seen < STALE_AFTER
+        }
+        if not paths:
+            # fall back to the last path rather than nothing
+            current = self._paths.get(self.source) if self.source else None
+            return current.device if current is not None else None
+
+        best = max(paths, key=lambda source: paths[source].score)
+        current = paths.get(self.source) if self.source else None
+        if current is None or paths[best].score >= current.score + ROUTE_HYSTERESIS:
+            self.source = best
+        return paths[self.source].device
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Summarize the paths for diagnostics."""
+        return {
+            "source": self.source,
+            "paths": {
+                source: {
+                    "score": round(path.score, 1),
+                    "rssi": list(path.rssi),
+                    "connects": list(path.connects),
+                    "last_seen": round(now - path.last_seen, 1),
+                }
+                for source, path in self._paths.items()
+            },
+        }
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import time
+from collections import deque
 from collections.abc import Callable
+from datetime import timedelta
+from statistics import fmean
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
@@ -10,9 +14,17 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
 )
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import callback
 
+from .const import (
+    CONF_RSSI_HYSTERESIS,
+    CONF_RSSI_INTERVAL,
+    CONF_RSSI_SMOOTHING,
+    DEFAULT_RSSI_HYSTERESIS,
+    DEFAULT_RSSI_INTERVAL,
+    DEFAULT_RSSI_SMOOTHING,
+)
 from .entity import DaybetterLedStripEntity
 
 if TYPE_CHECKING:
@@ -20,34 +32,11 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import DaybetterLedStripCoordinator
+    from .metrics import DaybetterLedStripMetrics
     from .models import DaybetterLedStripConfigEntry
 
-ENTITY_DESCRIPTIONS: tuple[tuple[SensorEntityDescription, UpdateFn], ...] = (
-    (
-        SensorEntityDescription(
-            key="rssi",
-            translation_key="bluetooth_rssi",
-            icon="mdi:wifi-strength-2",
-            entity_category=EntityCategory.DIAGNOSTIC,
-            device_class=SensorDeviceClass.SIGNAL_STRENGTH,
-            native_unit_of_measurement="dBm",
-            has_entity_name=True,
-        ),
-        lambda sensor: sensor.coordinator.data["rssi"]
-        if sensor.coordinator.data is not None
-        else None,
-    ),
-    (
-        SensorEntityDescription(
-            key="mac_address",
-            translation_key="mac_address",
-            icon="mdi:bluetooth",
-            entity_category=EntityCategory.DIAGNOSTIC,
-            has_entity_name=True,
-        ),
-        lambda sensor: sensor.coordinator.config_entry.runtime_data.device.address,
-    ),
-)
+# Polling interval of the metric sensors
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
 async def async_setup_entry(
@@ -57,12 +46,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     async_add_entities(
-        DaybetterLedStripSensor(
+        sensor_class(
             coordinator=entry.runtime_data.coordinator,
             entity_description=entity_description,
+            fields=fields,
             update_fn=fn,
         )
-        for entity_description, fn in ENTITY_DESCRIPTIONS
+        for sensor_class, entity_description, fields, fn in ENTITY_DESCRIPTIONS
     )
 
 
@@ -75,19 +65,217 @@ class DaybetterLedStripSensor(DaybetterLedStripEntity, SensorEntity):
         self,
         coordinator: DaybetterLedStripCoordinator,
         entity_description: SensorEntityDescription,
+        fields: frozenset[str],
         update_fn: UpdateFn,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator, entity_description.key)
+        super().__init__(coordinator, entity_description.key, fields)
         self.entity_description = entity_description
         self._update_fn = update_fn
         self._attr_native_value = self._update_fn(self)
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        self._attr_available = self.coordinator.data["connected"]
+        value = self._update_fn(self)
+        if value == self._attr_native_value and not self._available_changed():
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class DaybetterLedStripMetricSensor(DaybetterLedStripSensor):
+    """
+    Sensor for a performance metric, polled instead of pushed.
+
+    Metrics change with every write and advertisement, so they are read on
+    the polling interval rather than written on each change.
+    """
+
+    _attr_should_poll = True
+
+    async def async_update(self) -> None:
+        """Read the current value of the metric."""
         self._attr_native_value = self._update_fn(self)
+
+
+class DaybetterLedStripRssiSensor(DaybetterLedStripSensor):
+    """
+    RSSI sensor that only writes significant changes.
+
+    The value is a moving average of the last samples and is written when it
+    moved by at least the hysteresis and the update interval has passed.
+    """
+
+    def __init__(
+        self,
+        coordinator: DaybetterLedStripCoordinator,
+        entity_description: SensorEntityDescription,
+        fields: frozenset[str],
+        update_fn: UpdateFn,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, entity_description, fields, update_fn)
+        options = coordinator.config_entry.options
+        self._samples: deque[int] = deque(
+            maxlen=options.get(CONF_RSSI_SMOOTHING, DEFAULT_RSSI_SMOOTHING)
+        )
+        self._hysteresis = options.get(CONF_RSSI_HYSTERESIS, DEFAULT_RSSI_HYSTERESIS)
+        self._interval = options.get(CONF_RSSI_INTERVAL, DEFAULT_RSSI_INTERVAL)
+        self._last_write = 0.0
+        if self._attr_native_value is not None:
+            self._samples.append(self._attr_native_value)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if (rssi := self._update_fn(self)) is not None:
+            self._samples.append(rssi)
+        value = round(fmean(self._samples)) if self._samples else None
+
+        now = time.monotonic()
+        if (
+            not self._available_changed()
+            and value is not None
+            and self._attr_native_value is not None
+            and (
+                abs(value - self._attr_native_value) < self._hysteresis
+                or now - self._last_write < self._interval
+            )
+        ):
+            return
+
+        self._attr_native_value = value
+        self._last_write = now
         self.async_write_ha_state()
 
 
 UpdateFn = Callable[[DaybetterLedStripSensor], Any]
+
+
+def _metrics(sensor: DaybetterLedStripSensor) -> DaybetterLedStripMetrics:
+    return sensor.coordinator.config_entry.runtime_data.metrics
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+def _metric_description(key: str, **kwargs: Any) -> SensorEntityDescription:
+    """Describe a diagnostic metric sensor, disabled unless enabled by the user."""
+    return SensorEntityDescription(
+        key=key,
+        translation_key=key,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        has_entity_name=True,
+        **kwargs,
+    )
+
+
+# entity class, description, state fields the sensor depends on, value function
+ENTITY_DESCRIPTIONS: tuple[
+    tuple[
+        type[DaybetterLedStripSensor],
+        SensorEntityDescription,
+        frozenset[str],
+        UpdateFn,
+    ],
+    ...,
+] = (
+    (
+        DaybetterLedStripRssiSensor,
+        SensorEntityDescription(
+            key="rssi",
+            translation_key="bluetooth_rssi",
+            icon="mdi:wifi-strength-2",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+            native_unit_of_measurement="dBm",
+            has_entity_name=True,
+        ),
+        frozenset({"rssi"}),
+        lambda sensor: sensor.coordinator.data.rssi
+        if sensor.coordinator.data is not None
+        else None,
+    ),
+    (
+        DaybetterLedStripSensor,
+        SensorEntityDescription(
+            key="mac_address",
+            translation_key="mac_address",
+            icon="mdi:bluetooth",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            has_entity_name=True,
+        ),
+        # static, only availability changes are written
+        frozenset(),
+        lambda sensor: sensor.coordinator.config_entry.runtime_data.device.address,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description(
+            "command_latency",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        ),
+        frozenset(),
+        lambda sensor: _round(_metrics(sensor).command_latency.mean),
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description(
+            "connect_time",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        ),
+        frozenset(),
+        lambda sensor: _round(_metrics(sensor).connect_time.last),
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("write_failures", icon="mdi:alert-circle-outline"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).write_failures,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("connect_failures", icon="mdi:bluetooth-off"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).connect_failures,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("retries", icon="mdi:refresh"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).retries,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("queue_depth", icon="mdi:tray-full"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).queue_depth,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("advertisements_received", icon="mdi:access-point"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).advertisements_received,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description("advertisements_processed", icon="mdi:access-point"),
+        frozenset(),
+        lambda sensor: _metrics(sensor).advertisements_processed,
+    ),
+    (
+        DaybetterLedStripMetricSensor,
+        _metric_description(
+            "last_seen",
+            icon="mdi:clock-outline",
+            device_class=SensorDeviceClass.TIMESTAMP,
+        ),
+        frozenset(),
+        lambda sensor: _metrics(sensor).last_seen,
+    ),
+)
@@ -0,0 +1,383 @@
+"""Services for the Daybetter LED Strip integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Final
+
+import voluptuous as vol
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_EFFECT,
+    ATTR_RGB_COLOR,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_NAME, STATE_OFF, STATE_ON
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .commands import DaybetterLedStripCommand, context_priority
+from .connection import async_get_connection_manager
+from .const import (
+    CONF_COLOR_CORRECTION,
+    CONF_PREWARM_DURATION,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_PREWARM_DURATION,
+    DOMAIN,
+    Priority,
+)
+from .effects import HOST_EFFECTS
+from .light import build_turn_on_command
+from .prewarm import async_prewarm
+from .profiler import DEFAULT_SLOW_THRESHOLD, async_get_profiler
+from .snapshots import (
+    async_get_snapshots,
+    compile_restore_command,
+    state_to_snapshot,
+)
+
+if TYPE_CHECKING:
+    from .models import DaybetterLedStripConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_STATE: Final = "state"
+ATTR_MAX_CONCURRENCY: Final = "max_concurrency"
+ATTR_DURATION: Final = "duration"
+ATTR_SLOW_THRESHOLD: Final = "slow_threshold"
+
+SERVICE_SET_MANY = "set_many"
+SERVICE_SET_MANY_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_STATE, default=STATE_ON): vol.In([STATE_ON, STATE_OFF]),
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=255)
+        ),
+        vol.Optional(ATTR_RGB_COLOR): vol.All(
+            vol.Coerce(tuple), vol.ExactSequence((cv.byte, cv.byte, cv.byte))
+        ),
+        vol.Optional(ATTR_EFFECT): cv.string,
+        # concurrent strips per Bluetooth adapter or proxy
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONNECTIONS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+
+SERVICE_PREWARM = "prewarm"
+SERVICE_PREWARM_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        # seconds, defaults to the option of each strip
+        vol.Optional(ATTR_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=86400)
+        ),
+    }
+)
+
+SERVICE_PROFILE = "profile"
+SERVICE_PROFILE_SCHEMA: Final = vol.Schema(
+    {
+        # seconds
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+        # milliseconds
+        vol.Optional(ATTR_SLOW_THRESHOLD, default=DEFAULT_SLOW_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=1000)
+        ),
+    }
+)
+
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_SNAPSHOT_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    }
+)
+
+SERVICE_RESTORE = "restore"
+SERVICE_RESTORE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        # defaults to every strip of the snapshot that is still loaded
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONNECTIONS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+
+
+@callback
+def async_get_entries(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> dict[str, DaybetterLedStripConfigEntry]:
+    """Map entity ids of this integration to their loaded config entries."""
+    registry = er.async_get(hass)
+    entries: dict[str, DaybetterLedStripConfigEntry] = {}
+    for entity_id in entity_ids:
+        if (
+            (entity := registry.async_get(entity_id)) is None
+            or entity.platform != DOMAIN
+            or entity.config_entry_id is None
+            or (entry := hass.config_entries.async_get_entry(entity.config_entry_id))
+            is None
+        ):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_entity",
+                translation_placeholders={"entity_id": entity_id},
+            )
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unloaded_config_entry",
+                translation_placeholders={"config_entry": entry.title},
+            )
+        entries[entity_id] = entry
+    return entries
+
+
+async def async_fan_out(
+    hass: HomeAssistant,
+    commands: dict[str, tuple[DaybetterLedStripConfigEntry, DaybetterLedStripCommand]],
+    max_concurrency: int,
+    priority: Priority = Priority.AUTOMATION,
+) -> dict[str, Any]:
+    """
+    Send commands to many strips concurrently.
+
+    Strips on the same Bluetooth adapter or proxy are limited to
+    max_concurrency commands at a time. Returns the result of every strip.
+    """
+    connections = async_get_connection_manager(hass)
+    semaphores: defaultdict[str | None, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(max_concurrency)
+    )
+
+    async def _async_send(
+        entry: DaybetterLedStripConfigEntry,
+        command: DaybetterLedStripCommand,
+    ) -> dict[str, Any]:
+        device = entry.runtime_data.device
+        async with semaphores[connections.async_get_source(device)]:
+            start = hass.loop.time()
+            # a new command supersedes a running transition
+            entry.runtime_data.frames.async_cancel()
+            try:
+                await entry.runtime_data.commands.async_send(command, priority)
+            except Exception as err:  # noqa: BLE001 reported per strip
+                _LOGGER.debug("%s: command failed: %s", device.address, err)
+                return {
+                    "success": False,
+                    "error": str(err),
+                    "latency": round((hass.loop.time() - start) * 1000),
+                }
+            return {
+                "success": True,
+                "latency": round((hass.loop.time() - start) * 1000),
+            }
+
+    start = hass.loop.time()
+    results = await asyncio.gather(
+        *(_async_send(entry, command) for entry, command in commands.values())
+    )
+    return {
+        "strips": dict(zip(commands, results, strict=True)),
+        "duration": round((hass.loop.time() - start) * 1000),
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:  # noqa: PLR0915
+    """Register services."""
+
+    async def set_many(service_call: ServiceCall) -> ServiceResponse:
+        """Send one target state to many strips at once."""
+        # host effects are streamed by the light entity, not sent as a state
+        if (effect := service_call.data.get(ATTR_EFFECT)) in HOST_EFFECTS:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="host_effect_not_supported",
+                translation_placeholders={"effect": effect},
+            )
+        entries = async_get_entries(hass, service_call.data[ATTR_ENTITY_ID])
+
+        commands: dict[
+            str, tuple[DaybetterLedStripConfigEntry, DaybetterLedStripCommand]
+        ] = {}
+        for entity_id, entry in entries.items():
+            if service_call.data[ATTR_STATE] == STATE_OFF:
+                command = DaybetterLedStripCommand(power=False)
+            else:
+                command = build_turn_on_command(entry, service_call.data)
+            commands[entity_id] = (entry, command)
+
+        return await async_fan_out(
+            hass,
+            commands,
+            service_call.data[ATTR_MAX_CONCURRENCY],
+            context_priority(service_call.context),
+        )
+
+    async def prewarm(service_call: ServiceCall) -> ServiceResponse:
+        """Connect strips ahead of their next command."""
+        entries = async_get_entries(hass, service_call.data[ATTR_ENTITY_ID])
+        # one entry may have several entities
+        unique = {entry.entry_id: entry for entry in entries.values()}
+
+        results = await asyncio.gather(
+            *(
+                async_prewarm(
+                    hass,
+                    entry,
+                    service_call.data.get(
+                        ATTR_DURATION,
+                        entry.options.get(
+                            CONF_PREWARM_DURATION, DEFAULT_PREWARM_DURATION
+                        ),
+                    ),
+                )
+                for entry in unique.values()
+            )
+        )
+        connected = dict(zip(unique, results, strict=True))
+        return {
+            "strips": {
+                entity_id: {"connected": connected[entry.entry_id]}
+                for entity_id, entry in entries.items()
+            }
+        }
+
+    async def profile(service_call: ServiceCall) -> ServiceResponse:
+        """Measure the event loop time of every strip for a while."""
+        profiler = async_get_profiler(hass)
+        if profiler.enabled:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profiling_running"
+            )
+        profiler.async_start(service_call.data[ATTR_SLOW_THRESHOLD])
+        try:
+            await asyncio.sleep(service_call.data[ATTR_DURATION])
+        finally:
+            profiler.async_stop()
+        return profiler.as_dict()
+
+    async def snapshot(service_call: ServiceCall) -> ServiceResponse:
+        """Capture the state of many strips under a name."""
+        entries = async_get_entries(hass, service_call.data[ATTR_ENTITY_ID])
+        strips = {
+            entity_id: state_to_snapshot(entry.runtime_data.coordinator.data)
+            for entity_id, entry in entries.items()
+        }
+        await async_get_snapshots(hass).async_save(service_call.data[ATTR_NAME], strips)
+        return {"strips": strips}
+
+    async def restore(service_call: ServiceCall) -> ServiceResponse:
+        """Send every strip of a snapshot only what differs from it."""
+        name = service_call.data[ATTR_NAME]
+        if (strips := async_get_snapshots(hass).async_get(name)) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unknown_snapshot",
+                translation_placeholders={"name": name},
+            )
+        if ATTR_ENTITY_ID in service_call.data:
+            entries = async_get_entries(
+                hass,
+                [
+                    entity_id
+                    for entity_id in service_call.data[ATTR_ENTITY_ID]
+                    if entity_id in strips
+                ],
+            )
+        else:
+            # strips removed or unloaded since the snapshot are left out
+            entries = {}
+            for entity_id in strips:
+                with suppress(ServiceValidationError):
+                    entries |= async_get_entries(hass, [entity_id])
+
+        # plans are compiled up front, strips that match aren't contacted
+        commands: dict[
+            str, tuple[DaybetterLedStripConfigEntry, DaybetterLedStripCommand]
+        ] = {}
+        unchanged: list[str] = []
+        for entity_id, entry in entries.items():
+            runtime_data = entry.runtime_data
+            command = compile_restore_command(
+                strips[entity_id],
+                runtime_data.coordinator.data,
+                color_correction=entry.options.get(CONF_COLOR_CORRECTION, True),
+            )
+            if command is not None:
+                commands[entity_id] = (entry, command)
+            elif runtime_data.frames.running:
+                # the state matches by chance, the transition or effect is
+                # still stopped by the fan out
+                commands[entity_id] = (entry, DaybetterLedStripCommand())
+            else:
+                unchanged.append(entity_id)
+
+        result = await async_fan_out(
+            hass,
+            commands,
+            service_call.data[ATTR_MAX_CONCURRENCY],
+            context_priority(service_call.context),
+        )
+        result["unchanged"] = unchanged
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PREWARM,
+        prewarm,
+        schema=SERVICE_PREWARM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MANY,
+        set_many,
+        schema=SERVICE_SET_MANY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        snapshot,
+        schema=SERVICE_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        restore,
+        schema=SERVICE_RESTORE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
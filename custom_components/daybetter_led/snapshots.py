@@ -0,0 +1,116 @@
+"""Named state snapshots for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import logging
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from daybetter_led_strip.const import Effect
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .commands import DaybetterLedStripCommand
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .models import DaybetterLedStripState
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SNAPSHOTS: HassKey[DaybetterLedStripSnapshots] = HassKey(f"{DOMAIN}_snapshots")
+
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+
+
+@callback
+def async_get_snapshots(hass: HomeAssistant) -> DaybetterLedStripSnapshots:
+    """Get the integration-wide snapshots, creating them if needed."""
+    if (snapshots := hass.data.get(DATA_SNAPSHOTS)) is None:
+        snapshots = hass.data[DATA_SNAPSHOTS] = DaybetterLedStripSnapshots(hass)
+    return snapshots
+
+
+def state_to_snapshot(state: DaybetterLedStripState) -> dict[str, Any]:
+    """Capture the visible state of a strip."""
+    return {
+        "on": state.on,
+        "color": list(state.color) if state.color is not None else None,
+        "brightness": state.brightness,
+        "effect": int(state.effect) if state.effect is not None else None,
+    }
+
+
+def compile_restore_command(
+    snapshot: dict[str, Any],
+    state: DaybetterLedStripState,
+    *,
+    color_correction: bool = True,
+) -> DaybetterLedStripCommand | None:
+    """
+    Get the command that brings a strip from its state back to a snapshot.
+
+    Only attributes that differ are included, None if the strip already
+    matches. Attributes the snapshot doesn't know are left alone.
+    """
+    if snapshot["on"] is None:
+        return None
+    if not snapshot["on"]:
+        if state.on is False:
+            return None
+        return DaybetterLedStripCommand(power=False)
+
+    command = DaybetterLedStripCommand()
+    if state.on is not True:
+        command.power = True
+    if (brightness := snapshot["brightness"]) is not None and (
+        brightness != state.brightness
+    ):
+        command.brightness = brightness
+    if (color := snapshot["color"]) is not None:
+        if tuple(color) != state.color:
+            command.color = tuple(color)
+            command.color_correction = color_correction
+    elif (effect := snapshot["effect"]) is not None and effect != state.effect:
+        with suppress(ValueError):
+            command.effect = Effect(effect)
+
+    if command == DaybetterLedStripCommand():
+        return None
+    return command
+
+
+class DaybetterLedStripSnapshots:
+    """
+    Named snapshots of the state of many strips, kept across restarts.
+
+    Snapshots map entity ids to the state captured from their coordinator.
+    They are written to disk right away, as they are taken on purpose.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without any snapshots."""
+        self._store: Store[dict[str, dict[str, dict[str, Any]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshots: dict[str, dict[str, dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        """Read the snapshots from disk."""
+        if (data := await self._store.async_load()) is not None:
+            self._snapshots = data
+
+    @callback
+    def async_get(self, name: str) -> dict[str, dict[str, Any]] | None:
+        """Get a snapshot by name."""
+        return self._snapshots.get(name)
+
+    async def async_save(self, name: str, strips: dict[str, dict[str, Any]]) -> None:
+        """Store a snapshot, replacing any with the same name."""
+        self._snapshots[name] = strips
+        await self._store.async_save(self._snapshots)
+        _LOGGER.debug("Saved snapshot %s of %s strips", name, len(strips))
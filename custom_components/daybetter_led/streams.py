@@ -0,0 +1,64 @@
+"""Opening audio and frame sources for daybetter_led_strip."""
+
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+KIND_IMAGE = "image"
+KIND_DIRECTORY = "directory"
+KIND_PIPE = "pipe"
+
+
+def source_kind(path: str) -> str | None:
+    """Tell how frames are read from a path, None if it doesn't exist."""
+    try:
+        mode = Path(path).stat().st_mode
+    except FileNotFoundError:
+        return None
+    if stat.S_ISDIR(mode):
+        return KIND_DIRECTORY
+    if stat.S_ISFIFO(mode):
+        return KIND_PIPE
+    return KIND_IMAGE
+
+
+def _open_nonblocking(path: str) -> tuple[int, bool]:
+    """Open a file without waiting for a writer, and tell if it is a pipe."""
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        return fd, stat.S_ISFIFO(os.fstat(fd).st_mode)
+    except OSError:
+        os.close(fd)
+        raise
+
+
+async def async_open_stream(hass: HomeAssistant, path: str) -> BinaryIO:
+    """
+    Open a file or named pipe for reading, waiting for a pipe's writer.
+
+    A blocking open of a pipe holds an executor thread until a writer shows
+    up, even after the caller is cancelled. The pipe is opened without
+    blocking instead and its first data awaited in the event loop, then
+    reads block again so they can run in the executor.
+    """
+    fd, pipe = await hass.async_add_executor_job(_open_nonblocking, path)
+    try:
+        if pipe:
+            loop = hass.loop
+            readable = loop.create_future()
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+        os.set_blocking(fd, True)
+        return os.fdopen(fd, "rb")
+    except BaseException:
+        os.close(fd)
+        raise